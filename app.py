@@ -15,6 +15,11 @@ from datetime import datetime
 from flask import Flask, request, jsonify, g
 from flask_cors import CORS
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 app = Flask(__name__)
 CORS(app)
 
@@ -84,7 +89,7 @@ def embed_blob_async(blob_hash: str, content: str):
                 conn.commit()
                 cur.close()
                 conn.close()
-            except:
+            except Exception:
                 pass
 
     thread = threading.Thread(target=do_embed, daemon=True)
@@ -768,31 +773,39 @@ def semantic_startup():
     sacred_manifest = None
     tool_registry = None
 
-    # Fetch sacred_manifest
-    cur.execute("""
-        SELECT b.content FROM blobs b
-        WHERE b.content LIKE %s AND b.tenant_id = %s
-        ORDER BY b.created_at DESC LIMIT 1
-    """, ('%"type": "sacred_manifest"%', DEFAULT_TENANT))
-    row = cur.fetchone()
-    if row:
-        try:
-            sacred_manifest = json.loads(row['content'])
-        except:
-            pass
-
-    # Fetch tool_registry
+    # Fetch sacred_manifest + tool_registry in a single query (one table
+    # scan instead of two), keeping the latest blob of each kind
+    manifest_pattern = '%"type": "sacred_manifest"%'
+    registry_pattern = '%"type": "tool_registry"%'
     cur.execute("""
-        SELECT b.content FROM blobs b
-        WHERE b.content LIKE %s AND b.tenant_id = %s
-        ORDER BY b.created_at DESC LIMIT 1
-    """, ('%"type": "tool_registry"%', DEFAULT_TENANT))
-    row = cur.fetchone()
-    if row:
+        SELECT DISTINCT ON (kind)
+               CASE WHEN b.content LIKE %s THEN 'sacred_manifest'
+                    ELSE 'tool_registry' END AS kind,
+               b.content
+        FROM blobs b
+        WHERE (b.content LIKE %s OR b.content LIKE %s) AND b.tenant_id = %s
+        ORDER BY kind, b.created_at DESC
+    """, (manifest_pattern, manifest_pattern, registry_pattern, DEFAULT_TENANT))
+    for row in cur.fetchall():
+        raw = row['content']
+        # Cheap screen before paying for a full JSON parse: a manifest
+        # declares a "type" key near the top, but key ordering and JSON
+        # whitespace aren't guaranteed, so only require the key in the
+        # prefix and the tag somewhere in the blob. The parsed type is
+        # confirmed below either way.
+        if '"type"' not in raw[:200] or row['kind'] not in raw:
+            continue
         try:
-            tool_registry = json.loads(row['content'])
-        except:
-            pass
+            # orjson when present; blob bodies can be sizable
+            parsed = orjson.loads(raw) if orjson is not None else json.loads(raw)
+        except ValueError:
+            continue
+        if parsed.get('type') != row['kind']:
+            continue
+        if row['kind'] == 'sacred_manifest':
+            sacred_manifest = parsed
+        else:
+            tool_registry = parsed
 
     # Semantic search for contextually relevant memories
     relevant_memories = []
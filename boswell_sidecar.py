@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Boswell MCP Sidecar - shares one warm upstream connection across MCP processes.
+
+Claude Desktop spawns a fresh stdio MCP server per conversation, and each
+process would otherwise open its own TCP+TLS session to Boswell. This sidecar
+is a long-running local reverse proxy listening on a UNIX socket; it owns a
+single pooled HTTP/2 client and forwards any request path straight to the
+Boswell API. MCP servers detect the socket (BOSWELL_SIDECAR_SOCK) and speak
+plain HTTP over it, so the TLS handshake is paid once per user session
+instead of once per conversation.
+
+Run alongside the MCP servers:
+
+    python boswell_sidecar.py
+"""
+
+import contextlib
+import os
+import httpx
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+
+# Boswell API configuration - pulled from environment, Railway sets this
+BOSWELL_API = os.environ.get('BOSWELL_API', 'http://localhost:8000/v2')
+
+SOCKET_PATH = os.environ.get(
+    'BOSWELL_SIDECAR_SOCK',
+    os.path.join(os.environ.get('XDG_RUNTIME_DIR', '/tmp'), 'boswell-mcp.sock'),
+)
+
+# Headers worth forwarding upstream; everything else (host, connection
+# management) belongs to the hop, not the request
+FORWARD_HEADERS = ('content-type', 'x-boswell-internal')
+
+# The whole point of the sidecar: one client, long keepalive, shared by
+# every MCP process on the box
+client = httpx.AsyncClient(
+    base_url=BOSWELL_API,
+    timeout=httpx.Timeout(connect=3.0, read=20.0, write=10.0, pool=5.0),
+    # Limits and h2 must be given to the transport: httpx ignores the
+    # client-level kwargs when a custom transport is supplied.
+    transport=httpx.AsyncHTTPTransport(
+        retries=1,
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=4, max_connections=8,
+                            keepalive_expiry=600.0),
+    ),
+)
+
+
+async def proxy(request: Request):
+    """Forward the request verbatim to Boswell and relay the response."""
+    headers = {k: v for k, v in request.headers.items() if k.lower() in FORWARD_HEADERS}
+    try:
+        upstream = await client.request(
+            request.method,
+            "/" + request.path_params["path"],
+            params=request.url.query,
+            content=await request.body(),
+            headers=headers,
+        )
+    except httpx.HTTPError as e:
+        return Response(f"Sidecar upstream error: {e}", status_code=502)
+    return Response(
+        upstream.content,
+        status_code=upstream.status_code,
+        media_type=upstream.headers.get("content-type"),
+    )
+
+
+@contextlib.asynccontextmanager
+async def _lifespan(app):
+    """Release the upstream pool on shutdown (starlette 1.x dropped on_shutdown)."""
+    try:
+        yield
+    finally:
+        await client.aclose()
+
+
+app = Starlette(
+    debug=False,
+    routes=[
+        Route("/{path:path}", proxy, methods=["GET", "POST", "PATCH", "DELETE"]),
+    ],
+    lifespan=_lifespan,
+)
+
+
+if __name__ == "__main__":
+    import uvicorn
+    # Stale socket from a crashed run would block the bind
+    if os.path.exists(SOCKET_PATH):
+        os.unlink(SOCKET_PATH)
+    uvicorn.run(app, uds=SOCKET_PATH, loop="auto")
@@ -7,6 +7,9 @@ Implements MCP protocol with SSE transport for remote connections.
 
 import json
 import asyncio
+import contextlib
+import ssl
+import time
 import uuid
 import os
 from typing import Any, Dict
@@ -17,482 +20,601 @@ from starlette.requests import Request
 from starlette.responses import JSONResponse, Response
 from sse_starlette.sse import EventSourceResponse
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
 # Boswell API configuration - pulled from environment, Railway sets this
 BOSWELL_API = os.environ.get('BOSWELL_API', 'http://localhost:8000/v2')
 
 # Store for SSE sessions - maps session_id to response queue
 sessions: Dict[str, asyncio.Queue] = {}
 
+
+def _loads(raw):
+    """Parse JSON bytes/str, preferring orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _dumps(data):
+    """Pretty-print a tool result, preferring orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(data, indent=2)
+
+
+def _dumps_line(data):
+    """Compact single-line encoding for SSE frames."""
+    if orjson is not None:
+        return orjson.dumps(data).decode()
+    return json.dumps(data, separators=(",", ":"))
+
+
+# Upstream error bodies can be arbitrarily large HTML; a bounded snippet
+# is enough to diagnose without decoding megabytes into the error dict
+ERROR_SNIPPET_BYTES = 512
+
+
+def _error_detail(resp) -> str:
+    """Decode a capped slice of an error body, once, straight from bytes."""
+    detail = resp.content[:ERROR_SNIPPET_BYTES].decode("utf-8", errors="replace")
+    if len(resp.content) > ERROR_SNIPPET_BYTES:
+        detail += "..."
+    return detail
+
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson when available."""
+
+    def render(self, content) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content)
+        return super().render(content)
+
+# Schema fragments shared across tools - built once and referenced, not
+# re-spelled as fresh dict literals in every entry
+_BRANCH_NAME = {"type": "string", "description": "Branch name"}
+_RESULT_LIMIT = {"type": "integer", "description": "Max results (default: 10)", "default": 10}
+_SOURCE_BLOB = {"type": "string", "description": "Source memory blob hash"}
+_TARGET_BLOB = {"type": "string", "description": "Target memory blob hash"}
+
+
+def _obj(props, required=None):
+    """Build an object inputSchema, omitting 'required' when empty."""
+    return {"type": "object", "properties": props,
+            **({"required": required} if required else {})}
+
+
 # Tool definitions
 TOOLS = [
     {
         "name": "boswell_brief",
         "description": "Get a quick context brief of current Boswell state - recent commits, pending sessions, all branches. Use this at conversation start to understand what's been happening.",
-        "inputSchema": {
-            "type": "object",
-            "properties": {
-                "branch": {
-                    "type": "string",
-                    "description": "Branch to focus on (default: command-center)",
-                    "default": "command-center"
-                }
-            }
-        }
+        "inputSchema": _obj({
+            "branch": {"type": "string", "description": "Branch to focus on (default: command-center)", "default": "command-center"}
+        })
     },
     {
         "name": "boswell_branches",
         "description": "List all cognitive branches in Boswell. Branches are: tint-atlanta (CRM/business), iris (research/BCI), tint-empire (franchise), family (personal), command-center (infrastructure), boswell (memory system).",
-        "inputSchema": {"type": "object", "properties": {}}
+        "inputSchema": _obj({})
     },
     {
         "name": "boswell_head",
         "description": "Get the current HEAD commit for a specific branch.",
-        "inputSchema": {
-            "type": "object",
-            "properties": {
-                "branch": {"type": "string", "description": "Branch name"}
-            },
-            "required": ["branch"]
-        }
+        "inputSchema": _obj({"branch": _BRANCH_NAME}, required=["branch"])
     },
     {
         "name": "boswell_log",
         "description": "Get commit history for a branch. Shows what memories have been recorded.",
-        "inputSchema": {
-            "type": "object",
-            "properties": {
-                "branch": {"type": "string", "description": "Branch name"},
-                "limit": {"type": "integer", "description": "Max commits (default: 10)", "default": 10}
-            },
-            "required": ["branch"]
-        }
+        "inputSchema": _obj({
+            "branch": _BRANCH_NAME,
+            "limit": {"type": "integer", "description": "Max commits (default: 10)", "default": 10}
+        }, required=["branch"])
     },
     {
         "name": "boswell_search",
         "description": "Search memories across all branches by keyword. Returns matching content with commit info.",
-        "inputSchema": {
-            "type": "object",
-            "properties": {
-                "query": {"type": "string", "description": "Search query"},
-                "branch": {"type": "string", "description": "Optional: limit to branch"},
-                "limit": {"type": "integer", "description": "Max results (default: 10)", "default": 10}
-            },
-            "required": ["query"]
-        }
+        "inputSchema": _obj({
+            "query": {"type": "string", "description": "Search query"},
+            "branch": {"type": "string", "description": "Optional: limit to branch"},
+            "limit": _RESULT_LIMIT
+        }, required=["query"])
     },
     {
         "name": "boswell_semantic_search",
         "description": "Semantic search using AI embeddings. Finds conceptually related memories even without exact keyword matches. Use for conceptual queries like 'decisions about architecture' or 'patent opportunities'.",
-        "inputSchema": {
-            "type": "object",
-            "properties": {
-                "query": {"type": "string", "description": "Conceptual search query"},
-                "limit": {"type": "integer", "description": "Max results (default: 10)", "default": 10}
-            },
-            "required": ["query"]
-        }
+        "inputSchema": _obj({
+            "query": {"type": "string", "description": "Conceptual search query"},
+            "limit": _RESULT_LIMIT
+        }, required=["query"])
     },
     {
         "name": "boswell_recall",
         "description": "Recall a specific memory by its blob hash or commit hash.",
-        "inputSchema": {
-            "type": "object",
-            "properties": {
-                "hash": {"type": "string", "description": "Blob hash"},
-                "commit": {"type": "string", "description": "Or commit hash"}
-            }
-        }
+        "inputSchema": _obj({
+            "hash": {"type": "string", "description": "Blob hash"},
+            "commit": {"type": "string", "description": "Or commit hash"}
+        })
     },
     {
         "name": "boswell_links",
         "description": "List resonance links between memories. Shows cross-branch connections.",
-        "inputSchema": {
-            "type": "object",
-            "properties": {
-                "branch": {"type": "string", "description": "Optional: filter by branch"},
-                "link_type": {"type": "string", "description": "Optional: resonance, causal, etc."}
-            }
-        }
+        "inputSchema": _obj({
+            "branch": {"type": "string", "description": "Optional: filter by branch"},
+            "link_type": {"type": "string", "description": "Optional: resonance, causal, etc."}
+        })
     },
     {
         "name": "boswell_graph",
         "description": "Get the full memory graph - all nodes and edges.",
-        "inputSchema": {"type": "object", "properties": {}}
+        "inputSchema": _obj({})
     },
     {
         "name": "boswell_reflect",
         "description": "Get AI-surfaced insights - highly connected memories and patterns.",
-        "inputSchema": {"type": "object", "properties": {}}
+        "inputSchema": _obj({})
     },
     {
         "name": "boswell_commit",
         "description": "Commit a new memory to Boswell. Preserves important decisions and context.",
-        "inputSchema": {
-            "type": "object",
-            "properties": {
-                "branch": {"type": "string", "description": "Branch to commit to"},
-                "content": {"oneOf": [{"type": "object"}, {"type": "string"}], "description": "Memory content as JSON object or JSON string"},
-                "message": {"type": "string", "description": "Commit message"},
-                "tags": {"type": "array", "items": {"type": "string"}, "description": "Optional tags"}
-            },
-            "required": ["branch", "content", "message"]
-        }
+        "inputSchema": _obj({
+            "branch": {"type": "string", "description": "Branch to commit to"},
+            "content": {"oneOf": [{"type": "object"}, {"type": "string"}], "description": "Memory content as JSON object or JSON string"},
+            "message": {"type": "string", "description": "Commit message"},
+            "tags": {"type": "array", "items": {"type": "string"}, "description": "Optional tags"}
+        }, required=["branch", "content", "message"])
     },
     {
         "name": "boswell_link",
         "description": "Create a resonance link between two memories across branches.",
-        "inputSchema": {
-            "type": "object",
-            "properties": {
-                "source_blob": {"type": "string"},
-                "target_blob": {"type": "string"},
-                "source_branch": {"type": "string"},
-                "target_branch": {"type": "string"},
-                "link_type": {"type": "string", "default": "resonance"},
-                "reasoning": {"type": "string", "description": "Why connected"}
-            },
-            "required": ["source_blob", "target_blob", "source_branch", "target_branch", "reasoning"]
-        }
+        "inputSchema": _obj({
+            "source_blob": {"type": "string"},
+            "target_blob": {"type": "string"},
+            "source_branch": {"type": "string"},
+            "target_branch": {"type": "string"},
+            "link_type": {"type": "string", "default": "resonance"},
+            "reasoning": {"type": "string", "description": "Why connected"}
+        }, required=["source_blob", "target_blob", "source_branch", "target_branch", "reasoning"])
     },
     {
         "name": "boswell_checkout",
         "description": "Switch focus to a different cognitive branch.",
-        "inputSchema": {
-            "type": "object",
-            "properties": {
-                "branch": {"type": "string", "description": "Branch to check out"}
-            },
-            "required": ["branch"]
-        }
+        "inputSchema": _obj({
+            "branch": {"type": "string", "description": "Branch to check out"}
+        }, required=["branch"])
     },
     {
         "name": "boswell_startup",
         "description": "Load startup context in ONE call. Returns sacred_manifest (active commitments) + tool_registry (available tools). Call this FIRST at the start of every conversation.",
-        "inputSchema": {
-            "type": "object",
-            "properties": {}
-        }
+        "inputSchema": _obj({})
     },
     {
         "name": "boswell_create_task",
         "description": "Create a new task in the queue. Use to spawn subtasks or add work for yourself or other agents.",
-        "inputSchema": {
-            "type": "object",
-            "properties": {
-                "description": {"type": "string", "description": "What needs to be done"},
-                "branch": {"type": "string", "description": "Which branch this relates to (command-center, tint-atlanta, etc.)"},
-                "priority": {"type": "integer", "description": "Priority 1-10 (1=highest, default=5)"},
-                "assigned_to": {"type": "string", "description": "Optional: assign to specific instance"},
-                "metadata": {"type": "object", "description": "Optional: additional context"}
-            },
-            "required": ["description"]
-        }
+        "inputSchema": _obj({
+            "description": {"type": "string", "description": "What needs to be done"},
+            "branch": {"type": "string", "description": "Which branch this relates to (command-center, tint-atlanta, etc.)"},
+            "priority": {"type": "integer", "description": "Priority 1-10 (1=highest, default=5)"},
+            "assigned_to": {"type": "string", "description": "Optional: assign to specific instance"},
+            "metadata": {"type": "object", "description": "Optional: additional context"}
+        }, required=["description"])
     },
     {
         "name": "boswell_claim_task",
         "description": "Claim a task for this agent instance. Prevents other agents from working on it. Use when starting work on a task from the queue.",
-        "inputSchema": {
-            "type": "object",
-            "properties": {
-                "task_id": {"type": "string", "description": "Task ID to claim"},
-                "instance_id": {"type": "string", "description": "Your unique instance identifier (e.g., 'CC1', 'CW-PM')"}
-            },
-            "required": ["task_id", "instance_id"]
-        }
+        "inputSchema": _obj({
+            "task_id": {"type": "string", "description": "Task ID to claim"},
+            "instance_id": {"type": "string", "description": "Your unique instance identifier (e.g., 'CC1', 'CW-PM')"}
+        }, required=["task_id", "instance_id"])
     },
     {
         "name": "boswell_release_task",
         "description": "Release a claimed task. Use 'completed' when done, 'blocked' if stuck, 'manual' to unclaim without status change.",
-        "inputSchema": {
-            "type": "object",
-            "properties": {
-                "task_id": {"type": "string", "description": "Task ID to release"},
-                "instance_id": {"type": "string", "description": "Your instance identifier"},
-                "reason": {"type": "string", "enum": ["completed", "blocked", "timeout", "manual"], "description": "Why releasing (default: manual)"}
-            },
-            "required": ["task_id", "instance_id"]
-        }
+        "inputSchema": _obj({
+            "task_id": {"type": "string", "description": "Task ID to release"},
+            "instance_id": {"type": "string", "description": "Your instance identifier"},
+            "reason": {"type": "string", "enum": ["completed", "blocked", "timeout", "manual"], "description": "Why releasing (default: manual)"}
+        }, required=["task_id", "instance_id"])
     },
     {
         "name": "boswell_update_task",
         "description": "Update a task's fields (description, status, priority, metadata). Use to report progress or modify task details.",
-        "inputSchema": {
-            "type": "object",
-            "properties": {
-                "task_id": {"type": "string", "description": "Task ID to update"},
-                "status": {"type": "string", "enum": ["open", "claimed", "blocked", "done"], "description": "New status"},
-                "description": {"type": "string", "description": "Updated description"},
-                "priority": {"type": "integer", "description": "Priority (1=highest)"},
-                "metadata": {"type": "object", "description": "Additional metadata to merge"}
-            },
-            "required": ["task_id"]
-        }
+        "inputSchema": _obj({
+            "task_id": {"type": "string", "description": "Task ID to update"},
+            "status": {"type": "string", "enum": ["open", "claimed", "blocked", "done"], "description": "New status"},
+            "description": {"type": "string", "description": "Updated description"},
+            "priority": {"type": "integer", "description": "Priority (1=highest)"},
+            "metadata": {"type": "object", "description": "Additional metadata to merge"}
+        }, required=["task_id"])
     },
     {
         "name": "boswell_delete_task",
         "description": "Soft delete a task (sets status to 'deleted'). Use to clean up completed or cancelled tasks from the queue.",
-        "inputSchema": {
-            "type": "object",
-            "properties": {
-                "task_id": {"type": "string", "description": "Task ID to delete"}
-            },
-            "required": ["task_id"]
-        }
+        "inputSchema": _obj({
+            "task_id": {"type": "string", "description": "Task ID to delete"}
+        }, required=["task_id"])
     },
     {
         "name": "boswell_halt_tasks",
         "description": "EMERGENCY STOP - Halt all task processing. Blocks all claimed tasks, prevents new claims. Use when swarm behavior is problematic.",
-        "inputSchema": {
-            "type": "object",
-            "properties": {
-                "reason": {"type": "string", "description": "Why halting (default: 'Manual emergency halt')"}
-            }
-        }
+        "inputSchema": _obj({
+            "reason": {"type": "string", "description": "Why halting (default: 'Manual emergency halt')"}
+        })
     },
     {
         "name": "boswell_resume_tasks",
         "description": "Resume task processing after a halt. Clears the halt flag and allows new claims.",
-        "inputSchema": {
-            "type": "object",
-            "properties": {}
-        }
+        "inputSchema": _obj({})
     },
     {
         "name": "boswell_halt_status",
         "description": "Check if the task system is currently halted.",
-        "inputSchema": {
-            "type": "object",
-            "properties": {}
-        }
+        "inputSchema": _obj({})
     },
     # TRAILS (Memory Path Tracking)
     {
         "name": "boswell_record_trail",
         "description": "Record a traversal between two memories. Strengthens the path for future recall.",
-        "inputSchema": {
-            "type": "object",
-            "properties": {
-                "source_blob": {"type": "string", "description": "Source memory blob hash"},
-                "target_blob": {"type": "string", "description": "Target memory blob hash"}
-            },
-            "required": ["source_blob", "target_blob"]
-        }
+        "inputSchema": _obj({
+            "source_blob": _SOURCE_BLOB,
+            "target_blob": _TARGET_BLOB
+        }, required=["source_blob", "target_blob"])
     },
     {
         "name": "boswell_hot_trails",
         "description": "Get the strongest memory trails, sorted by strength. These are frequently traversed paths.",
-        "inputSchema": {
-            "type": "object",
-            "properties": {
-                "limit": {"type": "integer", "description": "Max trails to return (default: 20)"}
-            }
-        }
+        "inputSchema": _obj({
+            "limit": {"type": "integer", "description": "Max trails to return (default: 20)"}
+        })
     },
     {
         "name": "boswell_trails_from",
         "description": "Get outbound trails from a specific memory. Shows what memories are often accessed after this one.",
-        "inputSchema": {
-            "type": "object",
-            "properties": {
-                "blob": {"type": "string", "description": "Source memory blob hash"}
-            },
-            "required": ["blob"]
-        }
+        "inputSchema": _obj({"blob": _SOURCE_BLOB}, required=["blob"])
     },
     {
         "name": "boswell_trails_to",
         "description": "Get inbound trails to a specific memory. Shows what memories often lead to this one.",
-        "inputSchema": {
-            "type": "object",
-            "properties": {
-                "blob": {"type": "string", "description": "Target memory blob hash"}
-            },
-            "required": ["blob"]
-        }
+        "inputSchema": _obj({"blob": _TARGET_BLOB}, required=["blob"])
     },
 ]
 
+# JSON-RPC results that never vary, built once at import so the handshake
+# and tools/list don't re-allocate the same nested dicts per request
+INITIALIZE_RESULT = {
+    "protocolVersion": "2024-11-05",
+    "serverInfo": {
+        "name": "boswell-mcp",
+        "version": "1.0.0"
+    },
+    "capabilities": {
+        "tools": {}
+    }
+}
+TOOLS_RESULT = {"tools": TOOLS}
+
+# The manifest is a constant, so serialize it exactly once; orjson.Fragment
+# splices the prebuilt bytes into each response envelope instead of
+# re-walking 27 nested schema dicts per tools/list call
+if orjson is not None:
+    TOOLS_RESULT_JSON = orjson.Fragment(orjson.dumps(TOOLS_RESULT))
+else:
+    TOOLS_RESULT_JSON = TOOLS_RESULT
+
+# Required argument names per tool, extracted from the schemas once at
+# import so call-time validation is a tuple scan, not a schema walk. A
+# missing argument is rejected here instead of surfacing as a bare
+# KeyError from a route builder.
+REQUIRED_ARGS = {t["name"]: tuple(t["inputSchema"].get("required", ())) for t in TOOLS}
+
+
+# Read-only tools that are safe to coalesce when identical calls arrive
+# concurrently - duplicates share one upstream round-trip (singleflight)
+READ_TOOLS = frozenset({
+    "boswell_brief", "boswell_branches", "boswell_head", "boswell_log",
+    "boswell_search", "boswell_semantic_search", "boswell_recall",
+    "boswell_links", "boswell_graph", "boswell_reflect", "boswell_startup",
+    "boswell_hot_trails", "boswell_trails_from", "boswell_trails_to",
+    "boswell_halt_status",
+})
+
+# In-flight futures keyed by (tool, sorted args)
+_inflight: Dict[tuple, asyncio.Future] = {}
+
+# Small TTL cache so repeat reads inside a conversation skip the upstream
+# round-trip, mirroring the stdio server. One flat TTL keeps it simple;
+# any successful write clears the lot.
+CACHEABLE = frozenset({
+    "boswell_brief", "boswell_branches", "boswell_head", "boswell_log",
+    "boswell_graph", "boswell_reflect", "boswell_links",
+})
+CACHE_TTL = 30.0
+CACHE_MAX_ENTRIES = 256
+_cache: Dict[tuple, tuple] = {}
+
+
+def _cache_get(key):
+    """Return a fresh cached result, or None."""
+    entry = _cache.get(key)
+    if entry is None:
+        return None
+    ts, value = entry
+    if time.monotonic() - ts > CACHE_TTL:
+        _cache.pop(key, None)
+        return None
+    return value
+
+
+def _cache_put(key, value):
+    # FIFO eviction keeps the cache bounded (dicts preserve insert order)
+    while len(_cache) >= CACHE_MAX_ENTRIES:
+        _cache.pop(next(iter(_cache)))
+    _cache[key] = (time.monotonic(), value)
+
+# One SSLContext for the process so OpenSSL's session cache survives
+# reconnects - resumed TLS handshakes are 1-RTT (0-RTT on TLS 1.3)
+_SSL_CTX = ssl.create_default_context()
+
+# Shared upstream client: per-call AsyncClient construction threw away the
+# connection pool and TLS session state on every tool call
+_client: httpx.AsyncClient = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Return the shared AsyncClient, creating it on first use."""
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            base_url=BOSWELL_API,
+            timeout=30.0,
+            verify=_SSL_CTX,
+            http2=True,
+            # HTTP/2 multiplexes concurrent calls as streams on a few
+            # connections, so the pool can stay narrow; httpx falls back
+            # to HTTP/1.1 if the upstream doesn't negotiate h2
+            limits=httpx.Limits(max_keepalive_connections=4, max_connections=8,
+                                keepalive_expiry=60.0),
+        )
+    return _client
+
+
+def _is_error(result) -> bool:
+    """True for the error-dict shape; pass-through strings are successes."""
+    return isinstance(result, dict) and "error" in result
 
-async def call_boswell_tool(name: str, arguments: dict) -> dict:
-    """Execute a Boswell tool and return result."""
-    async with httpx.AsyncClient(timeout=30.0) as client:
+
+async def call_boswell_tool(name: str, arguments: dict) -> dict | str:
+    """Execute a Boswell tool, coalescing concurrent identical reads."""
+    missing = [k for k in REQUIRED_ARGS.get(name, ()) if k not in arguments]
+    if missing:
+        return {"error": f"{name} missing required argument(s): {', '.join(missing)}"}
+
+    if name not in READ_TOOLS:
+        result = await _execute_tool(name, arguments)
+        if not _is_error(result):
+            # A write may change what any read returns
+            _cache.clear()
+        return result
+
+    key = (name, tuple(sorted(arguments.items())))
+    if name in CACHEABLE:
+        cached = _cache_get(key)
+        if cached is not None:
+            return cached
+
+    existing = _inflight.get(key)
+    if existing is not None:
+        # Shield so the leader's cancellation (e.g. its client dropped the
+        # SSE connection) doesn't cancel us; if its future dies, fall back
+        # to issuing our own request.
         try:
-            if name == "boswell_brief":
-                branch = arguments.get("branch", "command-center")
-                resp = await client.get(f"{BOSWELL_API}/quick-brief", params={"branch": branch})
-
-            elif name == "boswell_branches":
-                resp = await client.get(f"{BOSWELL_API}/branches")
-
-            elif name == "boswell_head":
-                resp = await client.get(f"{BOSWELL_API}/head", params={"branch": arguments["branch"]})
-
-            elif name == "boswell_log":
-                params = {"branch": arguments["branch"]}
-                if "limit" in arguments:
-                    params["limit"] = arguments["limit"]
-                resp = await client.get(f"{BOSWELL_API}/log", params=params)
-
-            elif name == "boswell_search":
-                params = {"q": arguments["query"]}
-                if "branch" in arguments:
-                    params["branch"] = arguments["branch"]
-                if "limit" in arguments:
-                    params["limit"] = arguments["limit"]
-                resp = await client.get(f"{BOSWELL_API}/search", params=params)
-
-            elif name == "boswell_semantic_search":
-                params = {"q": arguments["query"]}
-                if "limit" in arguments:
-                    params["limit"] = arguments["limit"]
-                resp = await client.get(f"{BOSWELL_API}/semantic-search", params=params)
-
-            elif name == "boswell_recall":
-                params = {}
-                if "hash" in arguments:
-                    params["hash"] = arguments["hash"]
-                if "commit" in arguments:
-                    params["commit"] = arguments["commit"]
-                resp = await client.get(f"{BOSWELL_API}/recall", params=params)
-
-            elif name == "boswell_links":
-                params = {}
-                if "branch" in arguments:
-                    params["branch"] = arguments["branch"]
-                if "link_type" in arguments:
-                    params["link_type"] = arguments["link_type"]
-                resp = await client.get(f"{BOSWELL_API}/links", params=params)
-
-            elif name == "boswell_graph":
-                resp = await client.get(f"{BOSWELL_API}/graph")
-
-            elif name == "boswell_reflect":
-                resp = await client.get(f"{BOSWELL_API}/reflect")
-
-            elif name == "boswell_commit":
-                branch = arguments["branch"]
-                # Check if branch exists, create if not
-                head_check = await client.get(f"{BOSWELL_API}/head", params={"branch": branch})
-                if head_check.status_code == 404:
-                    # Branch doesn't exist - create it first
-                    await client.post(f"{BOSWELL_API}/branch", json={"name": branch})
-                
-                # Content must be a JSON object — parse if it arrives as a string
-                content = arguments["content"]
-                if isinstance(content, str):
-                    try:
-                        content = json.loads(content)
-                        if not isinstance(content, dict):
-                            return {"error": "Content must parse to a JSON object, not " + type(content).__name__}
-                    except (json.JSONDecodeError, TypeError):
-                        return {"error": "Content string is not valid JSON: " + content[:100]}
-
-                payload = {
-                    "branch": branch,
-                    "content": content,
-                    "message": arguments["message"],
-                    "author": "claude",
-                    "type": "memory"
-                }
-                if "tags" in arguments:
-                    payload["tags"] = arguments["tags"]
-                resp = await client.post(f"{BOSWELL_API}/commit", json=payload)
-
-            elif name == "boswell_link":
-                payload = {
-                    "source_blob": arguments["source_blob"],
-                    "target_blob": arguments["target_blob"],
-                    "source_branch": arguments["source_branch"],
-                    "target_branch": arguments["target_branch"],
-                    "link_type": arguments.get("link_type", "resonance"),
-                    "reasoning": arguments["reasoning"],
-                    "created_by": "claude-web"
-                }
-                resp = await client.post(f"{BOSWELL_API}/link", json=payload)
-
-            elif name == "boswell_checkout":
-                resp = await client.post(f"{BOSWELL_API}/checkout", json={"branch": arguments["branch"]})
-
-            elif name == "boswell_startup":
-                # v3: Use the /v2/startup endpoint which does proper LIKE query + semantic search
-                context = arguments.get("context", "important decisions and active commitments")
-                k = arguments.get("k", 5)
-                resp = await client.get(f"{BOSWELL_API}/startup", params={"context": context, "k": k})
-                if resp.status_code == 200:
-                    return resp.json()
-                else:
-                    return {"error": f"Startup failed: {resp.status_code}", "details": resp.text}
-
-            elif name == "boswell_create_task":
-                payload = {"description": arguments["description"]}
-                for field in ["branch", "priority", "assigned_to", "metadata"]:
-                    if field in arguments:
-                        payload[field] = arguments[field]
-                resp = await client.post(f"{BOSWELL_API}/tasks", json=payload)
-
-            elif name == "boswell_claim_task":
-                payload = {"instance_id": arguments["instance_id"]}
-                resp = await client.post(f"{BOSWELL_API}/tasks/{arguments['task_id']}/claim", json=payload)
-
-            elif name == "boswell_release_task":
-                payload = {
-                    "instance_id": arguments["instance_id"],
-                    "reason": arguments.get("reason", "manual")
-                }
-                resp = await client.post(f"{BOSWELL_API}/tasks/{arguments['task_id']}/release", json=payload)
-
-            elif name == "boswell_update_task":
-                payload = {}
-                for field in ["status", "description", "priority", "metadata"]:
-                    if field in arguments:
-                        payload[field] = arguments[field]
-                resp = await client.patch(f"{BOSWELL_API}/tasks/{arguments['task_id']}", json=payload)
-
-            elif name == "boswell_delete_task":
-                resp = await client.delete(f"{BOSWELL_API}/tasks/{arguments['task_id']}")
-
-            elif name == "boswell_halt_tasks":
-                payload = {}
-                if "reason" in arguments:
-                    payload["reason"] = arguments["reason"]
-                resp = await client.post(f"{BOSWELL_API}/tasks/halt", json=payload)
-
-            elif name == "boswell_resume_tasks":
-                resp = await client.post(f"{BOSWELL_API}/tasks/resume", json={})
-
-            elif name == "boswell_halt_status":
-                resp = await client.get(f"{BOSWELL_API}/tasks/halt-status")
-
-            # TRAILS
-            elif name == "boswell_record_trail":
-                payload = {
-                    "source_blob": arguments["source_blob"],
-                    "target_blob": arguments["target_blob"]
-                }
-                resp = await client.post(f"{BOSWELL_API}/trails/record", json=payload)
+            return await asyncio.shield(existing)
+        except asyncio.CancelledError:
+            if not existing.cancelled():
+                raise
+            return await _execute_tool(name, arguments)
 
-            elif name == "boswell_hot_trails":
-                params = {}
-                if "limit" in arguments:
-                    params["limit"] = arguments["limit"]
-                resp = await client.get(f"{BOSWELL_API}/trails/hot", params=params)
+    fut = asyncio.get_running_loop().create_future()
+    _inflight[key] = fut
+    try:
+        result = await _execute_tool(name, arguments)
+        fut.set_result(result)
+        if name in CACHEABLE and not _is_error(result):
+            _cache_put(key, result)
+        return result
+    finally:
+        if not fut.done():
+            fut.cancel()
+        _inflight.pop(key, None)
+
+
+def _pick(a, *keys):
+    """Copy the given keys from a when present - one dict probe per key."""
+    return {k: v for k in keys if (v := a.get(k)) is not None}
+
+
+# Declarative dispatch: tool name -> (method, path, kwargs builder), mirroring
+# the route table in server.py. boswell_commit stays a special case because it
+# auto-creates branches and normalizes string content.
+ROUTES = {
+    "boswell_brief": ("GET", "/quick-brief",
+                      lambda a: {"params": {"branch": a.get("branch", "command-center")}}),
+    "boswell_branches": ("GET", "/branches", lambda a: {}),
+    "boswell_head": ("GET", "/head",
+                     lambda a: {"params": {"branch": a["branch"]}}),
+    "boswell_log": ("GET", "/log",
+                    lambda a: {"params": {"branch": a["branch"], **_pick(a, "limit")}}),
+    "boswell_search": ("GET", "/search",
+                       lambda a: {"params": {"q": a["query"], **_pick(a, "branch", "limit")}}),
+    "boswell_semantic_search": ("GET", "/semantic-search",
+                                lambda a: {"params": {"q": a["query"], **_pick(a, "limit")}}),
+    "boswell_recall": ("GET", "/recall",
+                       lambda a: {"params": _pick(a, "hash", "commit")}),
+    "boswell_links": ("GET", "/links",
+                      lambda a: {"params": _pick(a, "branch", "link_type")}),
+    "boswell_graph": ("GET", "/graph", lambda a: {}),
+    "boswell_reflect": ("GET", "/reflect", lambda a: {}),
+    "boswell_link": ("POST", "/link",
+                     lambda a: {"json": {"source_blob": a["source_blob"],
+                                         "target_blob": a["target_blob"],
+                                         "source_branch": a["source_branch"],
+                                         "target_branch": a["target_branch"],
+                                         "link_type": a.get("link_type", "resonance"),
+                                         "reasoning": a["reasoning"],
+                                         "created_by": "claude-web"}}),
+    "boswell_checkout": ("POST", "/checkout",
+                         lambda a: {"json": {"branch": a["branch"]}}),
+    "boswell_startup": ("GET", "/startup",
+                        lambda a: {"params": {"context": a.get("context", "important decisions and active commitments"),
+                                              "k": a.get("k", 5)}}),
+    "boswell_create_task": ("POST", "/tasks",
+                            lambda a: {"json": {"description": a["description"],
+                                                **_pick(a, "branch", "priority", "assigned_to", "metadata")}}),
+    "boswell_claim_task": ("POST", "/tasks/{task_id}/claim",
+                           lambda a: {"json": {"instance_id": a["instance_id"]}}),
+    "boswell_release_task": ("POST", "/tasks/{task_id}/release",
+                             lambda a: {"json": {"instance_id": a["instance_id"],
+                                                 "reason": a.get("reason", "manual")}}),
+    "boswell_update_task": ("PATCH", "/tasks/{task_id}",
+                            lambda a: {"json": _pick(a, "status", "description", "priority", "metadata")}),
+    "boswell_delete_task": ("DELETE", "/tasks/{task_id}", lambda a: {}),
+    "boswell_halt_tasks": ("POST", "/tasks/halt",
+                           lambda a: {"json": _pick(a, "reason")}),
+    "boswell_resume_tasks": ("POST", "/tasks/resume", lambda a: {"json": {}}),
+    "boswell_halt_status": ("GET", "/tasks/halt-status", lambda a: {}),
+    "boswell_record_trail": ("POST", "/trails/record",
+                             lambda a: {"json": {"source_blob": a["source_blob"],
+                                                 "target_blob": a["target_blob"]}}),
+    "boswell_hot_trails": ("GET", "/trails/hot",
+                           lambda a: {"params": _pick(a, "limit")}),
+    "boswell_trails_from": ("GET", "/trails/from/{blob}", lambda a: {}),
+    "boswell_trails_to": ("GET", "/trails/to/{blob}", lambda a: {}),
+}
+
+
+async def _commit_tool(client: httpx.AsyncClient, arguments: dict) -> dict:
+    """boswell_commit: auto-create missing branches and normalize content."""
+    branch = arguments["branch"]
+    # Check if branch exists, create if not
+    head_check = await client.get("/head", params={"branch": branch})
+    if head_check.status_code == 404:
+        # Branch doesn't exist - create it first
+        await client.post("/branch", json={"name": branch})
+
+    # Content must be a JSON object — parse if it arrives as a string
+    content = arguments["content"]
+    if isinstance(content, str):
+        try:
+            content = _loads(content)
+            if not isinstance(content, dict):
+                return {"error": "Content must parse to a JSON object, not " + type(content).__name__}
+        except (ValueError, TypeError):
+            return {"error": "Content string is not valid JSON: " + content[:100]}
 
-            elif name == "boswell_trails_from":
-                resp = await client.get(f"{BOSWELL_API}/trails/from/{arguments['blob']}")
+    payload = {
+        "branch": branch,
+        "content": content,
+        "message": arguments["message"],
+        "author": "claude",
+        "type": "memory"
+    }
+    if "tags" in arguments:
+        payload["tags"] = arguments["tags"]
+    resp = await client.post("/commit", json=payload)
+    if resp.status_code in (200, 201):
+        return _loads(resp.content)
+    return {"error": f"HTTP {resp.status_code}", "details": _error_detail(resp)}
+
+
+async def _startup_tool(client: httpx.AsyncClient, arguments: dict) -> dict:
+    """boswell_startup with the quick-brief and branch list fetched concurrently.
 
-            elif name == "boswell_trails_to":
-                resp = await client.get(f"{BOSWELL_API}/trails/to/{arguments['blob']}")
+    Startup is the first call of every conversation, and brief and branches
+    requests almost always follow; overlapping all three costs one
+    round-trip. The extras are best-effort - startup still succeeds without
+    either section.
+    """
+    params = {"context": arguments.get("context", "important decisions and active commitments"),
+              "k": arguments.get("k", 5)}
+    startup, brief, branches = await asyncio.gather(
+        client.get("/startup", params=params),
+        client.get("/quick-brief", params={"branch": "command-center"}),
+        client.get("/branches"),
+        return_exceptions=True,
+    )
+    if isinstance(startup, BaseException):
+        return {"error": str(startup)}
+    if startup.status_code != 200:
+        return {"error": f"HTTP {startup.status_code}", "details": _error_detail(startup)}
+
+    data = _loads(startup.content)
+    for key, extra in (("brief", brief), ("branches", branches)):
+        if not isinstance(extra, BaseException) and extra.status_code == 200:
+            try:
+                data[key] = _loads(extra.content)
+            except ValueError:
+                pass
+    return data
+
+
+# Tools whose handling can't be expressed as a ROUTES row - the same
+# dict-lookup dispatch the stdio server uses, instead of name comparisons
+SPECIAL_TOOLS = {
+    "boswell_commit": _commit_tool,
+    "boswell_startup": _startup_tool,
+}
+
+# Tools whose payloads can be multi-MB on a grown knowledge graph; their
+# bodies are streamed into one buffer instead of letting httpx hold the
+# full response while .text makes a second decoded copy
+STREAM_TOOLS = frozenset({"boswell_graph", "boswell_log"})
+
+
+async def _execute_tool(name: str, arguments: dict) -> dict | str:
+    """Execute a Boswell tool; generic successes pass through as raw JSON text.
+
+    Only the commit and startup tools need the parsed body (routing checks,
+    response merging); everything else gets forwarded verbatim, skipping a
+    full parse + re-serialize on every proxied payload.
+    """
+    client = _get_client()
+    try:
+        special = SPECIAL_TOOLS.get(name)
+        if special is not None:
+            return await special(client, arguments)
 
-            else:
-                return {"error": f"Unknown tool: {name}"}
+        route = ROUTES.get(name)
+        if route is None:
+            return {"error": f"Unknown tool: {name}"}
 
-            if resp.status_code in (200, 201):
-                return resp.json()
-            else:
-                return {"error": f"HTTP {resp.status_code}", "details": resp.text}
+        method, path, build = route
+        if "{" in path:
+            path = path.format(**arguments)
 
-        except Exception as e:
-            return {"error": str(e)}
+        if name in STREAM_TOOLS:
+            async with client.stream(method, path, **build(arguments)) as resp:
+                if resp.status_code != 200:
+                    await resp.aread()
+                    return {"error": f"HTTP {resp.status_code}",
+                            "details": _error_detail(resp)}
+                buf = bytearray()
+                async for chunk in resp.aiter_bytes():
+                    buf.extend(chunk)
+                return buf.decode(errors="replace")
+
+        resp = await client.request(method, path, **build(arguments))
+
+        if resp.status_code in (200, 201):
+            return resp.text
+        else:
+            return {"error": f"HTTP {resp.status_code}", "details": _error_detail(resp)}
+
+    except Exception as e:
+        return {"error": str(e)}
 
 
 async def process_mcp_request(body: dict) -> dict:
@@ -502,23 +624,14 @@ async def process_mcp_request(body: dict) -> dict:
     request_id = body.get("id")
 
     if method == "initialize":
-        result = {
-            "protocolVersion": "2024-11-05",
-            "serverInfo": {
-                "name": "boswell-mcp",
-                "version": "1.0.0"
-            },
-            "capabilities": {
-                "tools": {}
-            }
-        }
+        result = INITIALIZE_RESULT
 
     elif method == "notifications/initialized":
         # Client confirms initialization - no response needed
         return None
 
     elif method == "tools/list":
-        result = {"tools": TOOLS}
+        result = TOOLS_RESULT_JSON
 
     elif method == "tools/call":
         tool_name = params.get("name")
@@ -528,10 +641,14 @@ async def process_mcp_request(body: dict) -> dict:
             "content": [
                 {
                     "type": "text",
-                    "text": json.dumps(tool_result, indent=2)
+                    "text": tool_result if isinstance(tool_result, str) else _dumps(tool_result)
                 }
             ]
         }
+        # Deterministic read results are rarely re-read within a session;
+        # hint the client not to spend prompt-cache writes on them
+        if tool_name in READ_TOOLS:
+            result["_meta"] = {"cache_hint": "no-cache"}
 
     elif method == "ping":
         result = {}
@@ -583,7 +700,7 @@ async def handle_sse(request: Request):
                     message = await asyncio.wait_for(queue.get(), timeout=30.0)
                     yield {
                         "event": "message",
-                        "data": json.dumps(message)
+                        "data": _dumps_line(message)
                     }
                 except asyncio.TimeoutError:
                     # Send keepalive ping
@@ -607,15 +724,15 @@ async def handle_messages(request: Request):
     session_id = request.path_params.get("session_id")
 
     if session_id not in sessions:
-        return JSONResponse(
+        return ORJSONResponse(
             {"error": "Session not found. Connect to /sse first."},
             status_code=404
         )
 
     try:
         body = await request.json()
-    except:
-        return JSONResponse({"error": "Invalid JSON"}, status_code=400)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return ORJSONResponse({"error": "Invalid JSON"}, status_code=400)
 
     # Process the request
     response = await process_mcp_request(body)
@@ -632,18 +749,18 @@ async def handle_mcp_post(request: Request):
     """Handle direct MCP JSON-RPC requests (non-SSE fallback)."""
     try:
         body = await request.json()
-    except:
-        return JSONResponse({"error": "Invalid JSON"}, status_code=400)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return ORJSONResponse({"error": "Invalid JSON"}, status_code=400)
 
     response = await process_mcp_request(body)
     if response is None:
         return Response(status_code=204)
-    return JSONResponse(response)
+    return ORJSONResponse(response)
 
 
 async def health_check(request: Request):
     """Health check endpoint."""
-    return JSONResponse({
+    return ORJSONResponse({
         "status": "ok",
         "server": "boswell-mcp",
         "version": "1.0.0",
@@ -655,15 +772,14 @@ async def health_check(request: Request):
 async def api_quick_brief(request: Request):
     """Direct HTTP endpoint for quick-brief - used by CC for recovery context."""
     branch = request.query_params.get("branch", "command-center")
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        try:
-            resp = await client.get(f"{BOSWELL_API}/quick-brief", params={"branch": branch})
-            if resp.status_code == 200:
-                return JSONResponse(resp.json())
-            else:
-                return JSONResponse({"error": f"HTTP {resp.status_code}", "details": resp.text}, status_code=resp.status_code)
-        except Exception as e:
-            return JSONResponse({"error": str(e)}, status_code=500)
+    try:
+        resp = await _get_client().get("/quick-brief", params={"branch": branch})
+        if resp.status_code == 200:
+            return ORJSONResponse(_loads(resp.content))
+        else:
+            return ORJSONResponse({"error": f"HTTP {resp.status_code}", "details": _error_detail(resp)}, status_code=resp.status_code)
+    except Exception as e:
+        return ORJSONResponse({"error": str(e)}, status_code=500)
 
 
 async def api_commit(request: Request):
@@ -681,14 +797,14 @@ async def api_commit(request: Request):
     """
     try:
         body = await request.json()
-    except:
-        return JSONResponse({"error": "Invalid JSON"}, status_code=400)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return ORJSONResponse({"error": "Invalid JSON"}, status_code=400)
 
     # Validate required fields
     required = ["branch", "message", "content"]
     missing = [f for f in required if f not in body]
     if missing:
-        return JSONResponse({"error": f"Missing required fields: {missing}"}, status_code=400)
+        return ORJSONResponse({"error": f"Missing required fields: {missing}"}, status_code=400)
 
     # Build payload for Boswell API
     payload = {
@@ -701,24 +817,38 @@ async def api_commit(request: Request):
     if "tags" in body:
         payload["tags"] = body["tags"]
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        try:
-            resp = await client.post(f"{BOSWELL_API}/commit", json=payload)
-            if resp.status_code in (200, 201):
-                return JSONResponse(resp.json(), status_code=201)
-            else:
-                return JSONResponse(
-                    {"error": f"Boswell API error", "status": resp.status_code, "details": resp.text},
-                    status_code=resp.status_code
-                )
-        except Exception as e:
-            return JSONResponse({"error": str(e)}, status_code=500)
+    try:
+        resp = await _get_client().post("/commit", json=payload)
+        if resp.status_code in (200, 201):
+            return ORJSONResponse(_loads(resp.content), status_code=201)
+        else:
+            return ORJSONResponse(
+                {"error": f"Boswell API error", "status": resp.status_code, "details": _error_detail(resp)},
+                status_code=resp.status_code
+            )
+    except Exception as e:
+        return ORJSONResponse({"error": str(e)}, status_code=500)
 
 
 # ==================== APP ====================
 
+@contextlib.asynccontextmanager
+async def _lifespan(app):
+    """Release the shared client's pool on server shutdown.
+
+    Registered as a lifespan rather than on_shutdown - starlette 1.x
+    removed that keyword, and requirements.txt has no upper bound.
+    """
+    try:
+        yield
+    finally:
+        if _client is not None:
+            await _client.aclose()
+
+
 app = Starlette(
     debug=False,
+    lifespan=_lifespan,
     routes=[
         Route("/", health_check, methods=["GET"]),
         Route("/health", health_check, methods=["GET"]),
@@ -734,4 +864,6 @@ app = Starlette(
 if __name__ == "__main__":
     import uvicorn
     port = int(os.environ.get("PORT", 8080))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    # loop="auto" picks uvloop when installed (it's in requirements.txt),
+    # falling back to the stdlib loop on platforms without it
+    uvicorn.run(app, host="0.0.0.0", port=port, loop="auto")
@@ -6,423 +6,841 @@ This server exposes 12 tools that map to the Boswell API endpoints,
 allowing Claude to search, recall, and commit memories directly.
 """
 
+import asyncio
+import io
 import json
+import logging
 import os
+import random
 import sys
+import time
 import httpx
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 from mcp.server import Server
 from mcp.types import Tool, TextContent
-from mcp.server.stdio import stdio_server
 
-# Debug logging to stderr (won't break stdio protocol)
-def log(msg):
-    print(f"[BOSWELL-DEBUG] {msg}", file=sys.stderr, flush=True)
+try:
+    from mcp.types import CallToolResult
+except ImportError:
+    CallToolResult = None
+
+# The lowlevel Server only accepts a CallToolResult return value from SDK
+# 1.19 on; older releases iterate it as a content sequence and every
+# hinted result comes back as an isError validation failure. Gate on the
+# installed version, not on the model's fields - those prove nothing
+# about what call_tool may return.
+try:
+    from importlib.metadata import version as _pkg_version
+    _MCP_VERSION = tuple(int(p) for p in _pkg_version("mcp").split(".")[:2])
+except Exception:
+    _MCP_VERSION = (0, 0)
+
+_META_SUPPORTED = CallToolResult is not None and _MCP_VERSION >= (1, 19)
+
+# Debug logging to stderr (won't break stdio protocol). Routed through
+# logging so the level check makes it inert by default - the old print
+# with flush=True paid a write+flush syscall pair several times per tool
+# call. The handler goes on our own logger, not the root, so httpx/mcp
+# warnings keep their normal formatting. Set BOSWELL_LOG_LEVEL=DEBUG to
+# get the old chatter back.
+_logger = logging.getLogger("boswell-mcp")
+_handler = logging.StreamHandler(sys.stderr)
+_handler.setFormatter(logging.Formatter('[BOSWELL-DEBUG] %(message)s'))
+_logger.addHandler(_handler)
+_logger.setLevel(os.environ.get('BOSWELL_LOG_LEVEL', 'WARNING'))
+_logger.propagate = False
+
+
+def log(msg, *args):
+    # %-style args defer formatting until the level check passes
+    _logger.debug(msg, *args)
 
 # Boswell API configuration - pulled from environment, Railway sets this
 BOSWELL_API = os.environ.get('BOSWELL_API', 'http://localhost:8000/v2')
 INTERNAL_SECRET = os.environ.get('INTERNAL_SECRET', '')
-log(f"BOSWELL_API = {BOSWELL_API}")
-log(f"INTERNAL_SECRET set: {bool(INTERNAL_SECRET)}")
+log("BOSWELL_API = %s", BOSWELL_API)
+log("INTERNAL_SECRET set: %s", bool(INTERNAL_SECRET))
 
 # Initialize MCP server
 app = Server("boswell-mcp")
 
+# ==================== RESPONSE CACHE ====================
+
+# In-process TTL cache so repeat reads skip the HTTP round-trip entirely.
+# Branch list and startup context change rarely; recall-by-hash is
+# content-addressed so a blob never changes once written (ttl=None = forever).
+CACHE_TTLS = {
+    "boswell_branches": 300.0,
+    "boswell_startup": 60.0,
+    "boswell_graph": 60.0,
+    "boswell_reflect": 60.0,
+    "boswell_links": 30.0,
+    "boswell_brief": 15.0,
+    "boswell_head": 10.0,
+    "boswell_halt_status": 2.0,
+}
+CACHE_MAX_ENTRIES = 256
+_cache = {}
+
+
+def _cache_get(key, ttl):
+    """Return a cached result if still fresh, else None."""
+    entry = _cache.get(key)
+    if entry is None:
+        return None
+    ts, value = entry
+    if ttl is not None and time.monotonic() - ts > ttl:
+        _cache.pop(key, None)
+        return None
+    return value
+
+
+def _cache_put(key, value):
+    # FIFO eviction keeps the cache bounded (dicts preserve insert order)
+    while len(_cache) >= CACHE_MAX_ENTRIES:
+        _cache.pop(next(iter(_cache)))
+    _cache[key] = (time.monotonic(), value)
+
+
+def _loads(raw):
+    """Parse JSON bytes/str with orjson when available (3-5x stdlib)."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def _dumps(data):
+    """Pretty-print a response payload with orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(data, indent=2)
+
+
+def _text(s, prompt_cache=True):
+    """Wrap a string as the single-item TextContent list MCP expects.
+
+    Deterministic read results pass prompt_cache=False and get marked
+    cache_hint=no-cache so the client skips prompt-cache writes for
+    output that is rarely re-read within a session.
+
+    model_construct skips pydantic validation - type is a constant and
+    text is always a str we built ourselves, so there is nothing to check.
+    """
+    content = [TextContent.model_construct(type="text", text=s)]
+    if not prompt_cache and _META_SUPPORTED:
+        return CallToolResult(content=content, _meta={"cache_hint": "no-cache"})
+    return content
+
+
+# Fixed error payloads, built once - these strings never vary, so the
+# hot error paths return a shared result instead of re-wrapping per call
+_TIMEOUT_RESULT = _text("Error: Request to Boswell API timed out")
+_CIRCUIT_OPEN_RESULT = _text(
+    "Error: Boswell API unavailable (circuit open, retrying shortly)",
+    prompt_cache=False,
+)
+
+# In-flight futures for read tools, keyed by (tool, sorted args). Concurrent
+# identical calls await the same future instead of each paying a round-trip.
+_inflight = {}
+
+
+# ==================== SEMANTIC CACHE ====================
+
+# Optional near-duplicate cache for the embedding-backed tools, which are
+# the most expensive upstream calls (embedding + vector search) and often
+# arrive as paraphrases of the same conceptual query. Off by default; set
+# BOSWELL_SEMCACHE=1 with sentence-transformers installed to enable.
+SEMCACHE_ENABLED = os.environ.get('BOSWELL_SEMCACHE', '') == '1'
+# Cosine floor for a hit - raise it if paraphrase matches come back wrong
+SEMCACHE_THRESHOLD = float(os.environ.get('BOSWELL_SEMCACHE_THRESHOLD', 0.87))
+SEMCACHE_MAX_ENTRIES = 128
+SEMCACHE_TTL = 300.0
+# Tool name -> the argument whose text is embedded for similarity matching
+SEMCACHE_TOOLS = {"boswell_semantic_search": "query", "boswell_startup": "context"}
+_sem_entries = []  # [(normalized embedding, monotonic ts, result)]
+_sem_model = None
+
+
+def _sem_encode(text):
+    """Embed text with a lazily-loaded MiniLM; None disables the cache."""
+    global _sem_model, SEMCACHE_ENABLED
+    if _sem_model is None:
+        try:
+            from sentence_transformers import SentenceTransformer
+            _sem_model = SentenceTransformer("all-MiniLM-L6-v2")
+        except ImportError:
+            log("BOSWELL_SEMCACHE=1 but sentence-transformers is not installed; disabling")
+            SEMCACHE_ENABLED = False
+            return None
+    return _sem_model.encode(text, normalize_embeddings=True)
+
+
+def _sem_get(emb):
+    """Return the best cached result within the similarity threshold."""
+    now = time.monotonic()
+    best_sim, best_result = SEMCACHE_THRESHOLD, None
+    for cached_emb, ts, result in _sem_entries:
+        if now - ts > SEMCACHE_TTL:
+            continue
+        sim = float(cached_emb @ emb)
+        if sim >= best_sim:
+            best_sim, best_result = sim, result
+    return best_result
+
+
+def _sem_put(emb, result):
+    if len(_sem_entries) >= SEMCACHE_MAX_ENTRIES:
+        _sem_entries.pop(0)
+    _sem_entries.append((emb, time.monotonic(), result))
+
 
 # ==================== TOOL DEFINITIONS ====================
 
-@app.list_tools()
-async def list_tools():
-    """Return list of available Boswell tools."""
-    return [
-        # READ OPERATIONS
-        Tool(
-            name="boswell_brief",
-            description="Get a quick context brief of current Boswell state - recent commits, pending sessions, all branches. Use this at conversation start to understand what's been happening.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "branch": {
-                        "type": "string",
-                        "description": "Branch to focus on (default: command-center)",
-                        "default": "command-center"
-                    }
+# Fixed vocabularies, validated locally so a typo costs an error string
+# instead of a full round-trip and an upstream 404. Branch membership is
+# only enforced for tools that navigate existing branches - boswell_commit
+# may legitimately create a new branch.
+KNOWN_BRANCHES = frozenset({
+    "tint-atlanta", "iris", "tint-empire", "family", "command-center", "boswell",
+})
+LINK_TYPES = frozenset({
+    "resonance", "causal", "contradiction", "elaboration", "application",
+})
+BRANCH_CHECKED_TOOLS = frozenset({"boswell_head", "boswell_log", "boswell_checkout"})
+
+# Tool definitions are static, so build the Tool objects once at import
+# time instead of reconstructing them on every ListTools request. A tuple,
+# because list_tools aliases it out to the SDK on every call - nothing
+# should be able to mutate the shared manifest.
+TOOLS = (
+    # READ OPERATIONS
+    Tool(
+        name="boswell_brief",
+        description="Get a quick context brief of current Boswell state - recent commits, pending sessions, all branches. Use this at conversation start to understand what's been happening.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "branch": {
+                    "type": "string",
+                    "description": "Branch to focus on (default: command-center)",
+                    "default": "command-center"
                 }
             }
-        ),
-        Tool(
-            name="boswell_branches",
-            description="List all cognitive branches in Boswell. Branches are: tint-atlanta (CRM/business), iris (research/BCI), tint-empire (franchise), family (personal), command-center (infrastructure), boswell (memory system).",
-            inputSchema={
-                "type": "object",
-                "properties": {}
-            }
-        ),
-        Tool(
-            name="boswell_head",
-            description="Get the current HEAD commit for a specific branch.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "branch": {
-                        "type": "string",
-                        "description": "Branch name (e.g., tint-atlanta, command-center, boswell)"
-                    }
+        }
+    ),
+    Tool(
+        name="boswell_branches",
+        description="List all cognitive branches in Boswell. Branches are: tint-atlanta (CRM/business), iris (research/BCI), tint-empire (franchise), family (personal), command-center (infrastructure), boswell (memory system).",
+        inputSchema={
+            "type": "object",
+            "properties": {}
+        }
+    ),
+    Tool(
+        name="boswell_head",
+        description="Get the current HEAD commit for a specific branch.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "branch": {
+                    "type": "string",
+                    "description": "Branch name (e.g., tint-atlanta, command-center, boswell)"
+                }
+            },
+            "required": ["branch"]
+        }
+    ),
+    Tool(
+        name="boswell_log",
+        description="Get commit history for a branch. Shows what memories have been recorded.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "branch": {
+                    "type": "string",
+                    "description": "Branch name"
                 },
-                "required": ["branch"]
-            }
-        ),
-        Tool(
-            name="boswell_log",
-            description="Get commit history for a branch. Shows what memories have been recorded.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "branch": {
-                        "type": "string",
-                        "description": "Branch name"
-                    },
-                    "limit": {
-                        "type": "integer",
-                        "description": "Max commits to return (default: 10)",
-                        "default": 10
-                    }
+                "limit": {
+                    "type": "integer",
+                    "description": "Max commits to return (default: 10)",
+                    "default": 10
+                }
+            },
+            "required": ["branch"]
+        }
+    ),
+    Tool(
+        name="boswell_search",
+        description="Search memories across all branches by keyword. Returns matching content with commit info.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "Search query"
                 },
-                "required": ["branch"]
-            }
-        ),
-        Tool(
-            name="boswell_search",
-            description="Search memories across all branches by keyword. Returns matching content with commit info.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "query": {
-                        "type": "string",
-                        "description": "Search query"
-                    },
-                    "branch": {
-                        "type": "string",
-                        "description": "Optional: limit search to specific branch"
-                    },
-                    "limit": {
-                        "type": "integer",
-                        "description": "Max results (default: 10)",
-                        "default": 10
-                    }
+                "branch": {
+                    "type": "string",
+                    "description": "Optional: limit search to specific branch"
                 },
-                "required": ["query"]
-            }
-        ),
-        Tool(
-            name="boswell_semantic_search",
-            description="Semantic search using AI embeddings. Finds conceptually related memories even without exact keyword matches. Use for conceptual queries like 'decisions about architecture' or 'patent opportunities'.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "query": {
-                        "type": "string",
-                        "description": "Conceptual search query"
-                    },
-                    "limit": {
-                        "type": "integer",
-                        "description": "Max results (default: 10)",
-                        "default": 10
-                    }
+                "limit": {
+                    "type": "integer",
+                    "description": "Max results (default: 10)",
+                    "default": 10
+                }
+            },
+            "required": ["query"]
+        }
+    ),
+    Tool(
+        name="boswell_semantic_search",
+        description="Semantic search using AI embeddings. Finds conceptually related memories even without exact keyword matches. Use for conceptual queries like 'decisions about architecture' or 'patent opportunities'.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "Conceptual search query"
                 },
-                "required": ["query"]
-            }
-        ),
-        Tool(
-            name="boswell_recall",
-            description="Recall a specific memory by its blob hash or commit hash.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "hash": {
-                        "type": "string",
-                        "description": "Blob hash to recall"
-                    },
-                    "commit": {
-                        "type": "string",
-                        "description": "Or commit hash to recall"
-                    }
+                "limit": {
+                    "type": "integer",
+                    "description": "Max results (default: 10)",
+                    "default": 10
                 }
-            }
-        ),
-        Tool(
-            name="boswell_links",
-            description="List resonance links between memories. Shows cross-branch connections.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "branch": {
-                        "type": "string",
-                        "description": "Optional: filter by branch"
-                    },
-                    "link_type": {
-                        "type": "string",
-                        "description": "Optional: filter by type (resonance, causal, contradiction, elaboration, application)"
-                    }
+            },
+            "required": ["query"]
+        }
+    ),
+    Tool(
+        name="boswell_recall",
+        description="Recall a specific memory by its blob hash or commit hash.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "hash": {
+                    "type": "string",
+                    "description": "Blob hash to recall"
+                },
+                "commit": {
+                    "type": "string",
+                    "description": "Or commit hash to recall"
                 }
             }
-        ),
-        Tool(
-            name="boswell_graph",
-            description="Get the full memory graph - all nodes (memories) and edges (links). Useful for understanding the topology.",
-            inputSchema={
-                "type": "object",
-                "properties": {}
-            }
-        ),
-        Tool(
-            name="boswell_reflect",
-            description="Get AI-surfaced insights - highly connected memories and cross-branch patterns.",
-            inputSchema={
-                "type": "object",
-                "properties": {}
-            }
-        ),
-
-        # WRITE OPERATIONS
-        Tool(
-            name="boswell_commit",
-            description="Commit a new memory to Boswell. Use this to preserve important decisions, insights, or context worth remembering.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "branch": {
-                        "type": "string",
-                        "description": "Branch to commit to (tint-atlanta, iris, tint-empire, family, command-center, boswell)"
-                    },
-                    "content": {
-                        "type": "object",
-                        "description": "Memory content as JSON object"
-                    },
-                    "message": {
-                        "type": "string",
-                        "description": "Commit message describing the memory"
-                    },
-                    "tags": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "Optional tags for categorization"
-                    },
-                    "force_branch": {
-                        "type": "boolean",
-                        "description": "Suppress routing warnings - use when intentionally committing to a branch despite mismatch"
-                    }
+        }
+    ),
+    Tool(
+        name="boswell_links",
+        description="List resonance links between memories. Shows cross-branch connections.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "branch": {
+                    "type": "string",
+                    "description": "Optional: filter by branch"
                 },
-                "required": ["branch", "content", "message"]
+                "link_type": {
+                    "type": "string",
+                    "description": "Optional: filter by type (resonance, causal, contradiction, elaboration, application)",
+                    "enum": sorted(LINK_TYPES)
+                }
             }
-        ),
-        Tool(
-            name="boswell_link",
-            description="Create a resonance link between two memories across branches. Links capture conceptual connections.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "source_blob": {
-                        "type": "string",
-                        "description": "Source memory blob hash"
-                    },
-                    "target_blob": {
-                        "type": "string",
-                        "description": "Target memory blob hash"
-                    },
-                    "source_branch": {
-                        "type": "string",
-                        "description": "Source branch name"
-                    },
-                    "target_branch": {
-                        "type": "string",
-                        "description": "Target branch name"
-                    },
-                    "link_type": {
-                        "type": "string",
-                        "description": "Type: resonance, causal, contradiction, elaboration, application",
-                        "default": "resonance"
-                    },
-                    "reasoning": {
-                        "type": "string",
-                        "description": "Why these memories are connected"
-                    }
+        }
+    ),
+    Tool(
+        name="boswell_graph",
+        description="Get the full memory graph - all nodes (memories) and edges (links). Useful for understanding the topology.",
+        inputSchema={
+            "type": "object",
+            "properties": {}
+        }
+    ),
+    Tool(
+        name="boswell_reflect",
+        description="Get AI-surfaced insights - highly connected memories and cross-branch patterns.",
+        inputSchema={
+            "type": "object",
+            "properties": {}
+        }
+    ),
+
+    # WRITE OPERATIONS
+    Tool(
+        name="boswell_commit",
+        description="Commit a new memory to Boswell. Use this to preserve important decisions, insights, or context worth remembering.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "branch": {
+                    "type": "string",
+                    "description": "Branch to commit to (tint-atlanta, iris, tint-empire, family, command-center, boswell)"
                 },
-                "required": ["source_blob", "target_blob", "source_branch", "target_branch", "reasoning"]
-            }
-        ),
-        Tool(
-            name="boswell_checkout",
-            description="Switch focus to a different cognitive branch.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "branch": {
-                        "type": "string",
-                        "description": "Branch to check out"
-                    }
+                "content": {
+                    "type": "object",
+                    "description": "Memory content as JSON object"
                 },
-                "required": ["branch"]
-            }
-        ),
-        Tool(
-            name="boswell_startup",
-            description="Load startup context. Returns commitments + semantically relevant memories. Call FIRST every conversation.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "context": {
-                        "type": "string",
-                        "description": "Optional context for semantic retrieval (default: 'important decisions and active commitments')"
+                "message": {
+                    "type": "string",
+                    "description": "Commit message describing the memory"
+                },
+                "tags": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Optional tags for categorization"
+                },
+                "force_branch": {
+                    "type": "boolean",
+                    "description": "Suppress routing warnings - use when intentionally committing to a branch despite mismatch"
+                }
+            },
+            "required": ["branch", "content", "message"]
+        }
+    ),
+    Tool(
+        name="boswell_commit_batch",
+        description="Commit several memories in one call. Use when preserving multiple decisions or insights at once - cheaper than separate boswell_commit calls.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "commits": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "branch": {"type": "string", "description": "Branch to commit to"},
+                            "content": {"type": "object", "description": "Memory content as JSON object"},
+                            "message": {"type": "string", "description": "Commit message"},
+                            "tags": {"type": "array", "items": {"type": "string"}, "description": "Optional tags"}
+                        },
+                        "required": ["branch", "content", "message"]
                     },
-                    "k": {
-                        "type": "integer",
-                        "description": "Number of relevant memories to return (default: 5)",
-                        "default": 5
-                    }
+                    "description": "Commits to record, in order"
                 }
-            }
-        ),
-
-        # TASK QUEUE OPERATIONS
-        Tool(
-            name="boswell_create_task",
-            description="Create a new task in the queue. Use to spawn subtasks or add work for yourself or other agents.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "description": {"type": "string", "description": "What needs to be done"},
-                    "branch": {"type": "string", "description": "Which branch this relates to (command-center, tint-atlanta, etc.)"},
-                    "priority": {"type": "integer", "description": "Priority 1-10 (1=highest, default=5)"},
-                    "assigned_to": {"type": "string", "description": "Optional: assign to specific instance"},
-                    "metadata": {"type": "object", "description": "Optional: additional context"}
+            },
+            "required": ["commits"]
+        }
+    ),
+    Tool(
+        name="boswell_link",
+        description="Create a resonance link between two memories across branches. Links capture conceptual connections.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "source_blob": {
+                    "type": "string",
+                    "description": "Source memory blob hash"
                 },
-                "required": ["description"]
-            }
-        ),
-        Tool(
-            name="boswell_claim_task",
-            description="Claim a task for this agent instance. Prevents other agents from working on it. Use when starting work on a task from the queue.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "task_id": {"type": "string", "description": "Task ID to claim"},
-                    "instance_id": {"type": "string", "description": "Your unique instance identifier (e.g., 'CC1', 'CW-PM')"}
+                "target_blob": {
+                    "type": "string",
+                    "description": "Target memory blob hash"
                 },
-                "required": ["task_id", "instance_id"]
-            }
-        ),
-        Tool(
-            name="boswell_release_task",
-            description="Release a claimed task. Use 'completed' when done, 'blocked' if stuck, 'manual' to unclaim without status change.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "task_id": {"type": "string", "description": "Task ID to release"},
-                    "instance_id": {"type": "string", "description": "Your instance identifier"},
-                    "reason": {"type": "string", "enum": ["completed", "blocked", "timeout", "manual"], "description": "Why releasing (default: manual)"}
+                "source_branch": {
+                    "type": "string",
+                    "description": "Source branch name"
                 },
-                "required": ["task_id", "instance_id"]
-            }
-        ),
-        Tool(
-            name="boswell_update_task",
-            description="Update a task's fields (description, status, priority, metadata). Use to report progress or modify task details.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "task_id": {"type": "string", "description": "Task ID to update"},
-                    "status": {"type": "string", "enum": ["open", "claimed", "blocked", "done"], "description": "New status"},
-                    "description": {"type": "string", "description": "Updated description"},
-                    "priority": {"type": "integer", "description": "Priority (1=highest)"},
-                    "metadata": {"type": "object", "description": "Additional metadata to merge"}
+                "target_branch": {
+                    "type": "string",
+                    "description": "Target branch name"
                 },
-                "required": ["task_id"]
-            }
-        ),
-        Tool(
-            name="boswell_delete_task",
-            description="Soft delete a task (sets status to 'deleted'). Use to clean up completed or cancelled tasks from the queue.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "task_id": {"type": "string", "description": "Task ID to delete"}
+                "link_type": {
+                    "type": "string",
+                    "description": "Type: resonance, causal, contradiction, elaboration, application",
+                    "enum": sorted(LINK_TYPES),
+                    "default": "resonance"
                 },
-                "required": ["task_id"]
-            }
-        ),
-        Tool(
-            name="boswell_halt_tasks",
-            description="EMERGENCY STOP - Halt all task processing. Blocks all claimed tasks, prevents new claims. Use when swarm behavior is problematic.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "reason": {"type": "string", "description": "Why halting (default: 'Manual emergency halt')"}
+                "reasoning": {
+                    "type": "string",
+                    "description": "Why these memories are connected"
                 }
-            }
-        ),
-        Tool(
-            name="boswell_resume_tasks",
-            description="Resume task processing after a halt. Clears the halt flag and allows new claims.",
-            inputSchema={
-                "type": "object",
-                "properties": {}
-            }
-        ),
-        Tool(
-            name="boswell_halt_status",
-            description="Check if the task system is currently halted.",
-            inputSchema={
-                "type": "object",
-                "properties": {}
-            }
-        ),
-
-        # TRAILS (Memory Path Tracking)
-        Tool(
-            name="boswell_record_trail",
-            description="Record a traversal between two memories. Strengthens the path for future recall.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "source_blob": {"type": "string", "description": "Source memory blob hash"},
-                    "target_blob": {"type": "string", "description": "Target memory blob hash"}
+            },
+            "required": ["source_blob", "target_blob", "source_branch", "target_branch", "reasoning"]
+        }
+    ),
+    Tool(
+        name="boswell_checkout",
+        description="Switch focus to a different cognitive branch.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "branch": {
+                    "type": "string",
+                    "description": "Branch to check out"
+                }
+            },
+            "required": ["branch"]
+        }
+    ),
+    Tool(
+        name="boswell_startup",
+        description="Load startup context. Returns commitments + semantically relevant memories. Call FIRST every conversation.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "context": {
+                    "type": "string",
+                    "description": "Optional context for semantic retrieval (default: 'important decisions and active commitments')"
                 },
-                "required": ["source_blob", "target_blob"]
-            }
-        ),
-        Tool(
-            name="boswell_hot_trails",
-            description="Get the strongest memory trails, sorted by strength. These are frequently traversed paths.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "limit": {"type": "integer", "description": "Max trails to return (default: 20)"}
+                "k": {
+                    "type": "integer",
+                    "description": "Number of relevant memories to return (default: 5)",
+                    "default": 5
                 }
             }
-        ),
-        Tool(
-            name="boswell_trails_from",
-            description="Get outbound trails from a specific memory. Shows what memories are often accessed after this one.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "blob": {"type": "string", "description": "Source memory blob hash"}
-                },
-                "required": ["blob"]
+        }
+    ),
+
+    # TASK QUEUE OPERATIONS
+    Tool(
+        name="boswell_create_task",
+        description="Create a new task in the queue. Use to spawn subtasks or add work for yourself or other agents.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "description": {"type": "string", "description": "What needs to be done"},
+                "branch": {"type": "string", "description": "Which branch this relates to (command-center, tint-atlanta, etc.)"},
+                "priority": {"type": "integer", "description": "Priority 1-10 (1=highest, default=5)"},
+                "assigned_to": {"type": "string", "description": "Optional: assign to specific instance"},
+                "metadata": {"type": "object", "description": "Optional: additional context"}
+            },
+            "required": ["description"]
+        }
+    ),
+    Tool(
+        name="boswell_create_tasks_bulk",
+        description="Create several tasks in one call. Use when enqueuing a batch of subtasks - cheaper than separate boswell_create_task calls.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "tasks": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "description": {"type": "string", "description": "What needs to be done"},
+                            "branch": {"type": "string", "description": "Which branch this relates to"},
+                            "priority": {"type": "integer", "description": "Priority 1-10 (1=highest, default=5)"},
+                            "assigned_to": {"type": "string", "description": "Optional: assign to specific instance"},
+                            "metadata": {"type": "object", "description": "Optional: additional context"}
+                        },
+                        "required": ["description"]
+                    },
+                    "description": "Tasks to create, in order"
+                }
+            },
+            "required": ["tasks"]
+        }
+    ),
+    Tool(
+        name="boswell_claim_task",
+        description="Claim a task for this agent instance. Prevents other agents from working on it. Use when starting work on a task from the queue.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "task_id": {"type": "string", "description": "Task ID to claim"},
+                "instance_id": {"type": "string", "description": "Your unique instance identifier (e.g., 'CC1', 'CW-PM')"}
+            },
+            "required": ["task_id", "instance_id"]
+        }
+    ),
+    Tool(
+        name="boswell_release_task",
+        description="Release a claimed task. Use 'completed' when done, 'blocked' if stuck, 'manual' to unclaim without status change.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "task_id": {"type": "string", "description": "Task ID to release"},
+                "instance_id": {"type": "string", "description": "Your instance identifier"},
+                "reason": {"type": "string", "enum": ["completed", "blocked", "timeout", "manual"], "description": "Why releasing (default: manual)"}
+            },
+            "required": ["task_id", "instance_id"]
+        }
+    ),
+    Tool(
+        name="boswell_update_task",
+        description="Update a task's fields (description, status, priority, metadata). Use to report progress or modify task details.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "task_id": {"type": "string", "description": "Task ID to update"},
+                "status": {"type": "string", "enum": ["open", "claimed", "blocked", "done"], "description": "New status"},
+                "description": {"type": "string", "description": "Updated description"},
+                "priority": {"type": "integer", "description": "Priority (1=highest)"},
+                "metadata": {"type": "object", "description": "Additional metadata to merge"}
+            },
+            "required": ["task_id"]
+        }
+    ),
+    Tool(
+        name="boswell_delete_task",
+        description="Soft delete a task (sets status to 'deleted'). Use to clean up completed or cancelled tasks from the queue.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "task_id": {"type": "string", "description": "Task ID to delete"}
+            },
+            "required": ["task_id"]
+        }
+    ),
+    Tool(
+        name="boswell_halt_tasks",
+        description="EMERGENCY STOP - Halt all task processing. Blocks all claimed tasks, prevents new claims. Use when swarm behavior is problematic.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "reason": {"type": "string", "description": "Why halting (default: 'Manual emergency halt')"}
             }
-        ),
-        Tool(
-            name="boswell_trails_to",
-            description="Get inbound trails to a specific memory. Shows what memories often lead to this one.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "blob": {"type": "string", "description": "Target memory blob hash"}
-                },
-                "required": ["blob"]
+        }
+    ),
+    Tool(
+        name="boswell_resume_tasks",
+        description="Resume task processing after a halt. Clears the halt flag and allows new claims.",
+        inputSchema={
+            "type": "object",
+            "properties": {}
+        }
+    ),
+    Tool(
+        name="boswell_halt_status",
+        description="Check if the task system is currently halted.",
+        inputSchema={
+            "type": "object",
+            "properties": {}
+        }
+    ),
+
+    # TRAILS (Memory Path Tracking)
+    Tool(
+        name="boswell_record_trail",
+        description="Record a traversal between two memories. Strengthens the path for future recall.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "source_blob": {"type": "string", "description": "Source memory blob hash"},
+                "target_blob": {"type": "string", "description": "Target memory blob hash"}
+            },
+            "required": ["source_blob", "target_blob"]
+        }
+    ),
+    Tool(
+        name="boswell_hot_trails",
+        description="Get the strongest memory trails, sorted by strength. These are frequently traversed paths.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "limit": {"type": "integer", "description": "Max trails to return (default: 20)"}
             }
-        ),
-    ]
+        }
+    ),
+    Tool(
+        name="boswell_trails_from",
+        description="Get outbound trails from a specific memory. Shows what memories are often accessed after this one.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "blob": {"type": "string", "description": "Source memory blob hash"}
+            },
+            "required": ["blob"]
+        }
+    ),
+    Tool(
+        name="boswell_trails_to",
+        description="Get inbound trails to a specific memory. Shows what memories often lead to this one.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "blob": {"type": "string", "description": "Target memory blob hash"}
+            },
+            "required": ["blob"]
+        }
+    ),
+)
+
+
+# Required argument names per tool, precompiled from the schemas above so a
+# bad call fails fast with a clear message instead of raising KeyError deep
+# inside a route builder.
+REQUIRED_ARGS = {t.name: tuple(t.inputSchema.get("required", ())) for t in TOOLS}
+
+# Known tool names as a frozenset: an unknown name bounces off one hash
+# probe instead of trickling through validation and cache checks first
+TOOL_NAMES = frozenset(t.name for t in TOOLS)
+
+
+# The SDK wants a list but only iterates it to serialize; one shared view
+# of the frozen tuple avoids re-materializing 28 Tool refs per poll.
+_TOOLS_LIST = list(TOOLS)
+
+
+@app.list_tools()
+async def list_tools():
+    """Return the precomputed Boswell tool manifest."""
+    return _TOOLS_LIST
+
+
+# ==================== ROUTE TABLE ====================
+
+# Declarative dispatch: tool name -> (method, path, kwargs builder).
+# Each builder returns the params/json kwargs passed straight to httpx,
+# so adding a tool is one table row instead of another elif branch.
+# Paths with {placeholders} are filled from the tool arguments.
+
+# Upstream bodies are forwarded verbatim by default - parse + re-indent
+# costs two O(N) passes and a second in-memory copy for purely cosmetic
+# gain. Set BOSWELL_PRETTY_JSON=1 (or pass pretty=true) to re-indent.
+PRETTY_JSON = os.environ.get('BOSWELL_PRETTY_JSON', '') == '1'
+
+# Defaults and constant payload fields, built once at import so handler
+# code copies references instead of re-allocating the same literals
+AUTHOR = "claude-web"
+DEFAULT_BRANCH = "command-center"
+DEFAULT_CTX = "important decisions and active commitments"
+COMMIT_BASE = {"author": AUTHOR, "type": "memory"}
+LINK_BASE = {"created_by": AUTHOR}
+
+# Granular timeouts: a dead TCP connect should fail in ~3s instead of eating
+# the whole budget that slow reads legitimately need
+TIMEOUT = httpx.Timeout(connect=3.0, read=20.0, write=10.0, pool=5.0)
+
+
+# Routes that take no request kwargs share one frozen-by-convention dict;
+# callers only ever **-unpack it, so per-call allocation buys nothing
+_NO_KWARGS = {}
+
+
+def _no_kwargs(a):
+    return _NO_KWARGS
+
+
+def _pick(a, *keys):
+    """Copy the given keys from a when present - one dict probe per key."""
+    return {k: v for k in keys if (v := a.get(k)) is not None}
+
+
+ROUTES = {
+    "boswell_brief": ("GET", "/quick-brief",
+                      lambda a: {"params": {"branch": a.get("branch", DEFAULT_BRANCH)}}),
+    "boswell_branches": ("GET", "/branches", _no_kwargs),
+    "boswell_head": ("GET", "/head",
+                     lambda a: {"params": {"branch": a["branch"]}}),
+    "boswell_log": ("GET", "/log",
+                    lambda a: {"params": {"branch": a["branch"], **_pick(a, "limit")}}),
+    "boswell_search": ("GET", "/search",
+                       lambda a: {"params": {"q": a["query"], **_pick(a, "branch", "limit")}}),
+    "boswell_semantic_search": ("GET", "/semantic-search",
+                                lambda a: {"params": {"q": a["query"], **_pick(a, "limit")}}),
+    "boswell_recall": ("GET", "/recall",
+                       lambda a: {"params": _pick(a, "hash", "commit")}),
+    "boswell_links": ("GET", "/links",
+                      lambda a: {"params": _pick(a, "branch", "link_type")}),
+    "boswell_graph": ("GET", "/graph", _no_kwargs),
+    "boswell_reflect": ("GET", "/reflect", _no_kwargs),
+    "boswell_commit": ("POST", "/commit",
+                       lambda a: {"json": {**COMMIT_BASE,
+                                           "branch": a["branch"],
+                                           "content": a["content"],
+                                           "message": a["message"],
+                                           **_pick(a, "tags"),
+                                           **({"force_branch": True} if a.get("force_branch") else {})}}),
+    "boswell_commit_batch": ("POST", "/commit/batch",
+                             lambda a: {"json": {**COMMIT_BASE, "commits": a["commits"]}}),
+    "boswell_link": ("POST", "/link",
+                     lambda a: {"json": {**LINK_BASE,
+                                         "source_blob": a["source_blob"],
+                                         "target_blob": a["target_blob"],
+                                         "source_branch": a["source_branch"],
+                                         "target_branch": a["target_branch"],
+                                         "link_type": a.get("link_type", "resonance"),
+                                         "reasoning": a["reasoning"]}}),
+    "boswell_checkout": ("POST", "/checkout",
+                         lambda a: {"json": {"branch": a["branch"]}}),
+    "boswell_startup": ("GET", "/startup",
+                        lambda a: {"params": {"context": a.get("context", DEFAULT_CTX),
+                                              "k": a.get("k", 5)}}),
+    "boswell_create_task": ("POST", "/tasks",
+                            lambda a: {"json": {"description": a["description"],
+                                                **_pick(a, "branch", "priority", "assigned_to", "metadata")}}),
+    "boswell_create_tasks_bulk": ("POST", "/tasks/bulk",
+                                  lambda a: {"json": {"tasks": a["tasks"]}}),
+    "boswell_claim_task": ("POST", "/tasks/{task_id}/claim",
+                           lambda a: {"json": {"instance_id": a["instance_id"]}}),
+    "boswell_release_task": ("POST", "/tasks/{task_id}/release",
+                             lambda a: {"json": {"instance_id": a["instance_id"],
+                                                 "reason": a.get("reason", "manual")}}),
+    "boswell_update_task": ("PATCH", "/tasks/{task_id}",
+                            lambda a: {"json": _pick(a, "status", "description", "priority", "metadata")}),
+    "boswell_delete_task": ("DELETE", "/tasks/{task_id}", _no_kwargs),
+    "boswell_halt_tasks": ("POST", "/tasks/halt",
+                           lambda a: {"json": _pick(a, "reason")}),
+    "boswell_resume_tasks": ("POST", "/tasks/resume", lambda a: {"json": {}}),
+    "boswell_halt_status": ("GET", "/tasks/halt-status", _no_kwargs),
+    "boswell_record_trail": ("POST", "/trails/record",
+                             lambda a: {"json": {"source_blob": a["source_blob"],
+                                                 "target_blob": a["target_blob"]}}),
+    "boswell_hot_trails": ("GET", "/trails/hot",
+                           lambda a: {"params": _pick(a, "limit")}),
+    "boswell_trails_from": ("GET", "/trails/from/{blob}", _no_kwargs),
+    "boswell_trails_to": ("GET", "/trails/to/{blob}", _no_kwargs),
+}
+
+# Static paths are parsed into httpx.URL once here instead of str->URL on
+# every request; templated paths stay strings and get formatted per call.
+ROUTES = {name: (method, path if "{" in path else httpx.URL(path), build)
+          for name, (method, path, build) in ROUTES.items()}
+
+
+# Shared HTTP client: one connection pool for the server lifetime instead of
+# a TCP+TLS handshake per tool call. Created lazily, closed in main().
+_CLIENT = None
+
+# Optional local sidecar (boswell_sidecar.py): a long-running daemon that
+# owns one warm upstream connection shared by every MCP process on the box.
+# When its UNIX socket exists we speak plain HTTP over it and let the
+# sidecar hold the TLS/HTTP2 session to Boswell.
+SIDECAR_SOCK = os.environ.get('BOSWELL_SIDECAR_SOCK', '')
+
+
+def _get_client():
+    """Return the shared AsyncClient, creating it on first use."""
+    global _CLIENT
+    if _CLIENT is None:
+        # The secret rides as a client default header - auth for stdio
+        # bypass - so handlers don't rebuild a headers dict per call
+        default_headers = {'X-Boswell-Internal': INTERNAL_SECRET} if INTERNAL_SECRET else {}
+        if SIDECAR_SOCK and os.path.exists(SIDECAR_SOCK):
+            log("Routing via sidecar at %s", SIDECAR_SOCK)
+            _CLIENT = httpx.AsyncClient(
+                # The hostname is cosmetic; the UDS transport decides where
+                # bytes actually go
+                base_url="http://boswell-sidecar",
+                timeout=TIMEOUT,
+                headers=default_headers,
+                transport=httpx.AsyncHTTPTransport(uds=SIDECAR_SOCK, retries=1),
+            )
+            return _CLIENT
+        # With HTTP/2 stream multiplexing a narrow pool is enough; a wide
+        # one just tempts httpx into opening extra connections under
+        # light concurrency. Falls back to HTTP/1.1 if ALPN lacks h2.
+        # Env-tunable for deployments fronting an HTTP/1.1-only Boswell,
+        # where bursts really do need one socket per in-flight call.
+        limits = httpx.Limits(
+            max_keepalive_connections=int(os.environ.get('BOSWELL_MAX_KEEPALIVE', 4)),
+            max_connections=int(os.environ.get('BOSWELL_MAX_CONN', 8)),
+            keepalive_expiry=float(os.environ.get('BOSWELL_KEEPALIVE_EXPIRY', 120.0)),
+        )
+        _CLIENT = httpx.AsyncClient(
+            base_url=BOSWELL_API,
+            timeout=TIMEOUT,
+            headers=default_headers,
+            # Pooling and h2 must ride on the transport: httpx ignores
+            # client-level limits/http2 when a custom transport is passed,
+            # so setting them on the client silently does nothing.
+            transport=httpx.AsyncHTTPTransport(retries=1, http2=True, limits=limits),
+        )
+    return _CLIENT
 
 
 # ==================== TOOL HANDLERS ====================
@@ -430,212 +848,536 @@ async def list_tools():
 @app.call_tool()
 async def call_tool(name: str, arguments: dict):
     """Handle tool calls by proxying to Boswell API."""
-    log(f"TOOL CALL START: {name} with args: {arguments}")
+    # The transport hands us a fresh str each call; interning it lets the
+    # ROUTES/REQUIRED_ARGS lookups below hit CPython's identity fast path
+    # against their compile-time-interned literal keys.
+    name = sys.intern(name)
+    log("TOOL CALL START: %s with args: %s", name, arguments)
+
+    if name not in TOOL_NAMES:
+        log("Unknown tool: %s", name)
+        return _text(f"Unknown tool: {name}")
+
+    # Validate required arguments up front, before any cache or HTTP work
+    missing = [k for k in REQUIRED_ARGS.get(name, ()) if k not in arguments]
+    if missing:
+        return _text(f"Error: {name} missing required argument(s): {', '.join(missing)}")
 
-    # Build headers - include internal secret for stdio auth bypass
-    headers = {}
-    if INTERNAL_SECRET:
-        headers['X-Boswell-Internal'] = INTERNAL_SECRET
+    # Short-circuit typos in fixed vocabularies without an upstream call
+    if name in BRANCH_CHECKED_TOOLS and arguments["branch"] not in KNOWN_BRANCHES:
+        return _text(f"Error: unknown branch '{arguments['branch']}'. "
+                     f"Valid branches: {', '.join(sorted(KNOWN_BRANCHES))}")
+    link_type = arguments.get("link_type")
+    if link_type is not None and link_type not in LINK_TYPES:
+        return _text(f"Error: unknown link_type '{link_type}'. "
+                     f"Valid types: {', '.join(sorted(LINK_TYPES))}")
 
-    async with httpx.AsyncClient(timeout=30.0, headers=headers) as client:
+    # Check the TTL cache before paying for an HTTP round-trip
+    cache_key = None
+    cache_ttl = None
+    args_key = None
+    if name in CACHE_TTLS:
+        args_key = tuple(sorted(arguments.items()))
+        cache_key = (name, args_key)
+        cache_ttl = CACHE_TTLS[name]
+    elif name == "boswell_recall" and arguments.get("hash"):
+        cache_key = ("boswell_recall", arguments["hash"])
+    if cache_key is not None:
+        cached = _cache_get(cache_key, cache_ttl)
+        if cached is not None:
+            log("Cache hit for %s", name)
+            return cached
+
+    # Near-duplicate queries against the embedding-backed tools can reuse
+    # a semantically-close cached answer (opt-in, see SEMCACHE_ENABLED)
+    sem_emb = None
+    if SEMCACHE_ENABLED and name in SEMCACHE_TOOLS:
+        sem_text = arguments.get(SEMCACHE_TOOLS[name])
+        if sem_text:
+            # encode() is CPU-bound; keep it off the event loop
+            sem_emb = await asyncio.to_thread(_sem_encode, sem_text)
+            if sem_emb is not None:
+                hit = _sem_get(sem_emb)
+                if hit is not None:
+                    log("Semantic cache hit for %s", name)
+                    return hit
+
+    route = ROUTES[name]
+
+    # Bespoke handlers (fan-out, batch fallback) dispatch through the same
+    # dict-lookup pattern as ROUTES; everything else takes the generic proxy
+    call = SPECIAL_CALLS.get(name, _proxy_call)
+
+    # Coalesce concurrent identical reads onto a single round-trip
+    # (singleflight). Writes always go out individually.
+    if route[0] != "GET":
+        return await call(name, arguments, route, cache_key)
+
+    # Reuse the tuple the cache probe built when there was one
+    if args_key is None:
+        args_key = tuple(sorted(arguments.items()))
+    flight_key = (name, args_key)
+    existing = _inflight.get(flight_key)
+    if existing is not None:
+        log("Joining in-flight request for %s", name)
+        # Shield so the leader's cancellation doesn't cancel followers; if
+        # the shared future dies anyway, fall back to a call of our own.
         try:
-            log(f"Making request to {BOSWELL_API} for tool: {name}")
-            if name == "boswell_brief":
-                branch = arguments.get("branch", "command-center")
-                resp = await client.get(f"{BOSWELL_API}/quick-brief", params={"branch": branch})
-
-            elif name == "boswell_branches":
-                resp = await client.get(f"{BOSWELL_API}/branches")
-
-            elif name == "boswell_head":
-                resp = await client.get(f"{BOSWELL_API}/head", params={"branch": arguments["branch"]})
-
-            elif name == "boswell_log":
-                params = {"branch": arguments["branch"]}
-                if "limit" in arguments:
-                    params["limit"] = arguments["limit"]
-                resp = await client.get(f"{BOSWELL_API}/log", params=params)
-
-            elif name == "boswell_search":
-                params = {"q": arguments["query"]}
-                if "branch" in arguments:
-                    params["branch"] = arguments["branch"]
-                if "limit" in arguments:
-                    params["limit"] = arguments["limit"]
-                resp = await client.get(f"{BOSWELL_API}/search", params=params)
-
-            elif name == "boswell_semantic_search":
-                params = {"q": arguments["query"]}
-                if "limit" in arguments:
-                    params["limit"] = arguments["limit"]
-                resp = await client.get(f"{BOSWELL_API}/semantic-search", params=params)
-
-            elif name == "boswell_recall":
-                params = {}
-                if "hash" in arguments:
-                    params["hash"] = arguments["hash"]
-                if "commit" in arguments:
-                    params["commit"] = arguments["commit"]
-                resp = await client.get(f"{BOSWELL_API}/recall", params=params)
-
-            elif name == "boswell_links":
-                params = {}
-                if "branch" in arguments:
-                    params["branch"] = arguments["branch"]
-                if "link_type" in arguments:
-                    params["link_type"] = arguments["link_type"]
-                resp = await client.get(f"{BOSWELL_API}/links", params=params)
-
-            elif name == "boswell_graph":
-                resp = await client.get(f"{BOSWELL_API}/graph")
-
-            elif name == "boswell_reflect":
-                resp = await client.get(f"{BOSWELL_API}/reflect")
-
-            elif name == "boswell_commit":
-                payload = {
-                    "branch": arguments["branch"],
-                    "content": arguments["content"],
-                    "message": arguments["message"],
-                    "author": "claude-web",
-                    "type": "memory"
-                }
-                if "tags" in arguments:
-                    payload["tags"] = arguments["tags"]
-                if arguments.get("force_branch"):
-                    payload["force_branch"] = True
-                resp = await client.post(f"{BOSWELL_API}/commit", json=payload)
-
-                # Phase 5: Surface routing warnings
-                if resp.status_code in (200, 201):
-                    data = resp.json()
-                    if "routing_suggestion" in data:
-                        rs = data["routing_suggestion"]
-                        warning = f"\n\nROUTING WARNING: {rs['message']}\nAdd force_branch=true to suppress."
-                        return [TextContent(type="text", text=json.dumps(data, indent=2) + warning)]
-
-            elif name == "boswell_link":
-                payload = {
-                    "source_blob": arguments["source_blob"],
-                    "target_blob": arguments["target_blob"],
-                    "source_branch": arguments["source_branch"],
-                    "target_branch": arguments["target_branch"],
-                    "link_type": arguments.get("link_type", "resonance"),
-                    "reasoning": arguments["reasoning"],
-                    "created_by": "claude-web"
-                }
-                resp = await client.post(f"{BOSWELL_API}/link", json=payload)
-
-            elif name == "boswell_checkout":
-                resp = await client.post(f"{BOSWELL_API}/checkout", json={"branch": arguments["branch"]})
-
-            elif name == "boswell_startup":
-                # v3: Use semantic startup endpoint for contextually relevant memories
-                context = arguments.get("context", "important decisions and active commitments")
-                k = arguments.get("k", 5)
-                resp = await client.get(
-                    f"{BOSWELL_API}/startup",
-                    params={"context": context, "k": k}
-                )
-                if resp.status_code == 200:
-                    return [TextContent(type="text", text=json.dumps(resp.json(), indent=2))]
-                else:
-                    return [TextContent(type="text", text=f"Error {resp.status_code}: {resp.text}")]
-
-            elif name == "boswell_create_task":
-                payload = {"description": arguments["description"]}
-                for field in ["branch", "priority", "assigned_to", "metadata"]:
-                    if field in arguments:
-                        payload[field] = arguments[field]
-                resp = await client.post(f"{BOSWELL_API}/tasks", json=payload)
-
-            elif name == "boswell_claim_task":
-                payload = {"instance_id": arguments["instance_id"]}
-                resp = await client.post(f"{BOSWELL_API}/tasks/{arguments['task_id']}/claim", json=payload)
-
-            elif name == "boswell_release_task":
-                payload = {
-                    "instance_id": arguments["instance_id"],
-                    "reason": arguments.get("reason", "manual")
-                }
-                resp = await client.post(f"{BOSWELL_API}/tasks/{arguments['task_id']}/release", json=payload)
-
-            elif name == "boswell_update_task":
-                payload = {}
-                for field in ["status", "description", "priority", "metadata"]:
-                    if field in arguments:
-                        payload[field] = arguments[field]
-                resp = await client.patch(f"{BOSWELL_API}/tasks/{arguments['task_id']}", json=payload)
-
-            elif name == "boswell_delete_task":
-                resp = await client.delete(f"{BOSWELL_API}/tasks/{arguments['task_id']}")
-
-            elif name == "boswell_halt_tasks":
-                payload = {}
-                if "reason" in arguments:
-                    payload["reason"] = arguments["reason"]
-                resp = await client.post(f"{BOSWELL_API}/tasks/halt", json=payload)
-
-            elif name == "boswell_resume_tasks":
-                resp = await client.post(f"{BOSWELL_API}/tasks/resume", json={})
-
-            elif name == "boswell_halt_status":
-                resp = await client.get(f"{BOSWELL_API}/tasks/halt-status")
-
-            # TRAILS
-            elif name == "boswell_record_trail":
-                payload = {
-                    "source_blob": arguments["source_blob"],
-                    "target_blob": arguments["target_blob"]
-                }
-                resp = await client.post(f"{BOSWELL_API}/trails/record", json=payload)
+            return await asyncio.shield(existing)
+        except asyncio.CancelledError:
+            if not existing.cancelled():
+                raise
+            return await call(name, arguments, route, cache_key)
+
+    fut = asyncio.get_running_loop().create_future()
+    _inflight[flight_key] = fut
+    try:
+        result = await call(name, arguments, route, cache_key)
+        fut.set_result(result)
+        if sem_emb is not None:
+            content = getattr(result, "content", result)
+            # Don't cache failures for 5 minutes: error payloads are either
+            # plain "Error ..." text or a _dumps({"error": ...}) object whose
+            # sole top-level key lands in the first few characters.
+            text = content[0].text if content else ""
+            if text and not text.startswith("Error") and '"error"' not in text[:16]:
+                _sem_put(sem_emb, result)
+        return result
+    finally:
+        if not fut.done():
+            fut.cancel()
+        _inflight.pop(flight_key, None)
+
 
-            elif name == "boswell_hot_trails":
-                params = {}
-                if "limit" in arguments:
-                    params["limit"] = arguments["limit"]
-                resp = await client.get(f"{BOSWELL_API}/trails/hot", params=params)
+async def _commit_batch(name, arguments, route, cache_key):
+    """Record several memories in one round-trip.
 
-            elif name == "boswell_trails_from":
-                resp = await client.get(f"{BOSWELL_API}/trails/from/{arguments['blob']}")
+    Prefers the server-side POST /commit/batch; when Boswell doesn't expose
+    it yet (404/405), the individual commits are fired concurrently over the
+    shared connection instead - still one handshake, overlapped RTTs. The
+    read cache is invalidated once at the end, not per commit.
+    """
+    if _breaker_open():
+        log("Circuit open, failing %s fast", name)
+        return _CIRCUIT_OPEN_RESULT
 
-            elif name == "boswell_trails_to":
-                resp = await client.get(f"{BOSWELL_API}/trails/to/{arguments['blob']}")
+    commits = arguments["commits"]
+    client = _get_client()
+    try:
+        resp = await client.post("/commit/batch", json={**COMMIT_BASE, "commits": commits})
+        _breaker_record(True)
+        if resp.status_code not in (404, 405):
+            if resp.status_code in (200, 201):
+                _invalidate_read_cache()
+                return _text(_dumps(_loads(resp.content)))
+            return _error_text(resp)
 
+        # Older Boswell without the batch endpoint: overlap per-item POSTs
+        log("No /commit/batch upstream, falling back to concurrent commits")
+        responses = await asyncio.gather(
+            *(client.post("/commit", json={**COMMIT_BASE, **c}) for c in commits),
+            return_exceptions=True,
+        )
+        results = []
+        for commit, r in zip(commits, responses):
+            if isinstance(r, BaseException):
+                results.append({"error": str(r), "message": commit.get("message")})
+            elif r.status_code in (200, 201):
+                results.append(_loads(r.content))
             else:
-                log(f"Unknown tool: {name}")
-                return [TextContent(type="text", text=f"Unknown tool: {name}")]
-
-            # Format response
-            log(f"Got response: status={resp.status_code}")
-            if resp.status_code == 200 or resp.status_code == 201:
-                try:
-                    data = resp.json()
-                    log(f"Returning success response for {name}")
-                    return [TextContent(type="text", text=json.dumps(data, indent=2))]
-                except:
-                    log(f"Returning raw text response for {name}")
-                    return [TextContent(type="text", text=resp.text)]
+                results.append({"error": f"HTTP {r.status_code}",
+                                "message": commit.get("message")})
+        _invalidate_read_cache()
+        return _text(_dumps({"results": results}))
+
+    except httpx.TimeoutException:
+        _breaker_record(False)
+        log("TIMEOUT for tool boswell_commit_batch")
+        return _TIMEOUT_RESULT
+    except Exception as e:
+        if isinstance(e, httpx.TransportError):
+            _breaker_record(False)
+        _logger.exception("Tool boswell_commit_batch failed")
+        err = {"kind": type(e).__name__, "message": str(e), "tool": "boswell_commit_batch"}
+        return _text(_dumps({"error": err}), prompt_cache=False)
+
+
+async def _create_tasks_bulk(name, arguments, route, cache_key):
+    """Enqueue several tasks in one round-trip.
+
+    Prefers a server-side POST /tasks/bulk; when Boswell doesn't expose it
+    yet (404/405), the individual creates are fired concurrently over the
+    shared connection - same shape as the commit-batch fallback.
+    """
+    if _breaker_open():
+        log("Circuit open, failing %s fast", name)
+        return _CIRCUIT_OPEN_RESULT
+
+    tasks = arguments["tasks"]
+    client = _get_client()
+    try:
+        resp = await client.post("/tasks/bulk", json={"tasks": tasks})
+        _breaker_record(True)
+        if resp.status_code not in (404, 405):
+            if resp.status_code in (200, 201):
+                _invalidate_read_cache()
+                return _text(_dumps(_loads(resp.content)))
+            return _error_text(resp)
+
+        # Older Boswell without the bulk endpoint: overlap per-item POSTs
+        log("No /tasks/bulk upstream, falling back to concurrent creates")
+        responses = await asyncio.gather(
+            *(client.post("/tasks", json=t) for t in tasks),
+            return_exceptions=True,
+        )
+        results = []
+        for task, r in zip(tasks, responses):
+            if isinstance(r, BaseException):
+                results.append({"error": str(r), "description": task.get("description")})
+            elif r.status_code in (200, 201):
+                results.append(_loads(r.content))
+            else:
+                results.append({"error": f"HTTP {r.status_code}",
+                                "description": task.get("description")})
+        _invalidate_read_cache()
+        return _text(_dumps({"results": results}))
+
+    except httpx.TimeoutException:
+        _breaker_record(False)
+        log("TIMEOUT for tool boswell_create_tasks_bulk")
+        return _TIMEOUT_RESULT
+    except Exception as e:
+        if isinstance(e, httpx.TransportError):
+            _breaker_record(False)
+        _logger.exception("Tool boswell_create_tasks_bulk failed")
+        err = {"kind": type(e).__name__, "message": str(e), "tool": "boswell_create_tasks_bulk"}
+        return _text(_dumps({"error": err}), prompt_cache=False)
+
+
+async def _startup_prefetch(name, arguments, route, cache_key):
+    """Serve boswell_startup plus the reads Claude always asks for next.
+
+    The bootstrap ritual is /startup followed by /quick-brief, /branches and
+    /reflect — four sequential round-trips. Issuing them concurrently costs
+    one RTT; on HTTP/2 all four multiplex over the shared connection. The
+    secondary fetches are best-effort: if one fails, startup still succeeds
+    without that section.
+    """
+    if _breaker_open():
+        log("Circuit open, failing %s fast", name)
+        return _CIRCUIT_OPEN_RESULT
+
+    client = _get_client()
+    try:
+        startup, brief, branches, reflect = await asyncio.gather(
+            client.get("/startup", **route[2](arguments)),
+            client.get("/quick-brief", params={"branch": DEFAULT_BRANCH}),
+            client.get("/branches"),
+            client.get("/reflect"),
+            return_exceptions=True,
+        )
+        if isinstance(startup, BaseException):
+            raise startup
+        # Only the primary fetch feeds the breaker; the best-effort
+        # secondaries already tolerate individual failure.
+        _breaker_record(True)
+        if startup.status_code not in (200, 201):
+            return _error_text(startup)
+
+        data = _loads(startup.content)
+        for key, resp in (("brief", brief), ("branches", branches), ("reflect", reflect)):
+            if isinstance(resp, BaseException) or resp.status_code != 200:
+                continue
+            try:
+                data[key] = _loads(resp.content)
+            except ValueError:
+                pass
+
+        result = _text(_dumps(data), prompt_cache=False)
+        if cache_key is not None:
+            _cache_put(cache_key, result)
+        return result
+
+    except httpx.TimeoutException:
+        _breaker_record(False)
+        log("TIMEOUT for tool %s", name)
+        return _TIMEOUT_RESULT
+    except Exception as e:
+        if isinstance(e, httpx.TransportError):
+            _breaker_record(False)
+        _logger.exception("Tool %s failed", name)
+        err = {"kind": type(e).__name__, "message": str(e), "tool": name}
+        return _text(_dumps({"error": err}), prompt_cache=False)
+
+
+# Upstream error pages can be arbitrarily large and every byte fed back
+# becomes prompt tokens; half a KB of body is plenty of diagnostic context
+ERROR_SNIPPET_BYTES = 512
+
+
+def _error_text(resp):
+    """Format an upstream error with a bounded body snippet.
+
+    Slicing resp.content avoids eagerly decoding the whole body the way
+    resp.text would.
+    """
+    snippet = resp.content[:ERROR_SNIPPET_BYTES].decode("utf-8", errors="replace")
+    if len(resp.content) > ERROR_SNIPPET_BYTES:
+        snippet += "..."
+    return _text(f"Error {resp.status_code}: {snippet}")
+
+
+def _invalidate_read_cache():
+    """Drop cached reads after a successful write.
+
+    Any write (commit, link, checkout, task ops) can change what the read
+    endpoints return. Recall-by-hash survives - blobs are content-addressed
+    and immutable once written.
+    """
+    for stale in [k for k in _cache if k[0] != "boswell_recall"]:
+        _cache.pop(stale, None)
+    # New memories can change what semantic queries should surface
+    _sem_entries.clear()
+
+
+# Upstream statuses worth a second try - transient by definition
+RETRYABLE_STATUS = frozenset({502, 503, 504})
+
+# Circuit breaker: after several consecutive transport failures, fail fast
+# for a cooldown window instead of letting every call eat a full timeout
+# against an upstream that is plainly down.
+BREAKER_THRESHOLD = 5
+BREAKER_COOLDOWN = 10.0
+_breaker = {"fail_streak": 0, "open_until": 0.0}
+
+
+def _breaker_open():
+    return time.monotonic() < _breaker["open_until"]
+
+
+def _breaker_record(ok):
+    if ok:
+        _breaker["fail_streak"] = 0
+        return
+    _breaker["fail_streak"] += 1
+    if _breaker["fail_streak"] >= BREAKER_THRESHOLD:
+        _breaker["open_until"] = time.monotonic() + BREAKER_COOLDOWN
+        log("Circuit open for %ss after %s transport failures", BREAKER_COOLDOWN, _breaker["fail_streak"])
+
+
+async def _request(client, method, path, kw):
+    """Issue one upstream request; idempotent GETs retry transient failures.
+
+    5xx gateway errors and connection-level hiccups get up to two retries
+    with jittered exponential backoff (100ms, 200ms base) so a blip doesn't
+    bounce all the way through the model. 4xx pass straight through, and
+    writes are never retried - a commit that timed out may have landed.
+    """
+    if method != "GET":
+        return await client.request(method, path, **kw)
+
+    for attempt in range(3):
+        try:
+            resp = await client.request("GET", path, **kw)
+            if resp.status_code not in RETRYABLE_STATUS or attempt == 2:
+                return resp
+            log("Retryable %s from %s, attempt %s", resp.status_code, path, attempt + 1)
+        except (httpx.ConnectError, httpx.RemoteProtocolError, httpx.ReadError) as e:
+            if attempt == 2:
+                raise
+            log("Retryable transport error on %s: %s", path, e)
+        await asyncio.sleep(0.1 * (2 ** attempt) + random.random() * 0.05)
+
+
+# Tools whose payloads can be multi-MB on a grown knowledge graph.
+# These are streamed into a single buffer instead of letting httpx hold
+# the full body while resp.text makes a second decoded copy.
+STREAM_TOOLS = frozenset({"boswell_graph", "boswell_log"})
+
+
+async def _stream_text(client, path, kw):
+    """GET a large response body straight into a str, ~1x body size peak.
+
+    Streaming bypasses _request, so the same retry policy is applied here:
+    these are idempotent GETs, and transient transport errors or 5xx
+    gateway responses get up to two more tries with the same backoff.
+    Returns (resp, text) - text is None on a non-200 so the caller can
+    fall through to the usual error formatting.
+    """
+    for attempt in range(3):
+        try:
+            async with client.stream("GET", path, **kw) as resp:
+                if resp.status_code in RETRYABLE_STATUS and attempt < 2:
+                    log("Retryable %s from %s, attempt %s",
+                        resp.status_code, path, attempt + 1)
+                elif resp.status_code != 200:
+                    await resp.aread()
+                    return resp, None
+                else:
+                    buf = bytearray()
+                    async for chunk in resp.aiter_bytes():
+                        buf.extend(chunk)
+                    return resp, buf.decode(errors="replace")
+        except (httpx.ConnectError, httpx.RemoteProtocolError, httpx.ReadError) as e:
+            if attempt == 2:
+                raise
+            log("Retryable transport error on %s: %s", path, e)
+        await asyncio.sleep(0.1 * (2 ** attempt) + random.random() * 0.05)
+
+
+async def _proxy_call(name, arguments, route, cache_key):
+    """Proxy a single tool call to the Boswell API and format the response."""
+    if _breaker_open():
+        log("Circuit open, failing %s fast", name)
+        return _CIRCUIT_OPEN_RESULT
+
+    client = _get_client()
+    try:
+        method, path, build = route
+        if isinstance(path, str):
+            path = path.format(**arguments)
+        log("Making request to %s%s for tool: %s", BOSWELL_API, path, name)
+
+        if name in STREAM_TOOLS and not (PRETTY_JSON or arguments.get("pretty")):
+            resp, body = await _stream_text(client, path, build(arguments))
+            _breaker_record(True)
+            if body is None:
+                log("Returning error response: %s", resp.status_code)
+                return _error_text(resp)
+            result = _text(body, prompt_cache=False)
+            if cache_key is not None:
+                _cache_put(cache_key, result)
+            return result
+
+        resp = await _request(client, method, path, build(arguments))
+        _breaker_record(True)
+
+        if resp.status_code in (200, 201) and method != "GET":
+            _invalidate_read_cache()
+
+        # Phase 5: Surface routing warnings on commits. The cheap byte scan
+        # decides whether the full parse is worth it - most commits carry no
+        # suggestion, and the key can't appear inside committed content
+        # without the upstream echoing it at the top level anyway.
+        if (name == "boswell_commit" and resp.status_code in (200, 201)
+                and b'"routing_suggestion"' in resp.content):
+            data = _loads(resp.content)
+            if "routing_suggestion" in data:
+                rs = data["routing_suggestion"]
+                warning = f"\n\nROUTING WARNING: {rs['message']}\nAdd force_branch=true to suppress."
+                return _text(_dumps(data) + warning)
+
+        # Format response
+        log("Got response: status=%s", resp.status_code)
+        if resp.status_code == 200 or resp.status_code == 201:
+            # Content-type decides the path - no try/except on the hot path,
+            # and nothing broader than a parse failure can get swallowed.
+            if ((PRETTY_JSON or arguments.get("pretty"))
+                    and "json" in resp.headers.get("content-type", "")):
+                log("Returning pretty-printed response for %s", name)
+                result = _text(_dumps(_loads(resp.content)), prompt_cache=(method != "GET"))
             else:
-                log(f"Returning error response: {resp.status_code}")
-                return [TextContent(type="text", text=f"Error {resp.status_code}: {resp.text}")]
+                # Upstream text is already valid JSON (or plain text);
+                # forward it without a decode + re-encode round-trip
+                log("Returning pass-through response for %s", name)
+                result = _text(resp.text, prompt_cache=(method != "GET"))
+            if cache_key is not None:
+                _cache_put(cache_key, result)
+            return result
+        else:
+            log("Returning error response: %s", resp.status_code)
+            return _error_text(resp)
+
+    except httpx.TimeoutException:
+        _breaker_record(False)
+        log("TIMEOUT for tool %s", name)
+        return _TIMEOUT_RESULT
+    except Exception as e:
+        if isinstance(e, httpx.TransportError):
+            _breaker_record(False)
+        # Structured error so the model can branch on kind instead of
+        # parsing prose; full traceback goes to stderr for debugging
+        _logger.exception("Tool %s failed", name)
+        err = {"kind": type(e).__name__, "message": str(e), "tool": name}
+        if isinstance(e, httpx.HTTPStatusError):
+            err["status_code"] = e.response.status_code
+            err["detail"] = e.response.text[:500]
+        return _text(_dumps({"error": err}), prompt_cache=False)
 
-        except httpx.TimeoutException:
-            log(f"TIMEOUT for tool {name}")
-            return [TextContent(type="text", text="Error: Request to Boswell API timed out")]
-        except Exception as e:
-            log(f"EXCEPTION for tool {name}: {str(e)}")
-            return [TextContent(type="text", text=f"Error: {str(e)}")]
+
+# Tools whose handling can't be expressed as a ROUTES row. Kept as a dict
+# so dispatch stays a lookup rather than inline name comparisons.
+SPECIAL_CALLS = {
+    "boswell_startup": _startup_prefetch,
+    "boswell_commit_batch": _commit_batch,
+    "boswell_create_tasks_bulk": _create_tasks_bulk,
+}
 
 
 # ==================== MAIN ====================
 
+# Default stdin buffering is small, so a large boswell_commit payload arrives
+# as many read() syscalls. 1 MiB coalesces even big memory blobs into a few.
+STDIO_BUFFER_SIZE = 1 << 20
+
+
+def _widen_stdio_buffers():
+    """Rebind stdin/stdout with larger buffers before the transport wraps them.
+
+    A multi-MB graph response through the default 8KB stdout buffer costs
+    hundreds of write syscalls; a 1MB buffer flushes it in a handful, so
+    the event loop gets back to the next read sooner.
+    """
+    try:
+        stdin_fd = os.dup(sys.stdin.fileno())
+        sys.stdin = io.TextIOWrapper(
+            io.BufferedReader(io.FileIO(stdin_fd), buffer_size=STDIO_BUFFER_SIZE),
+            encoding="utf-8",
+        )
+    except (OSError, ValueError) as e:
+        # Keep the default stream if stdin can't be rewrapped
+        log("Could not widen stdin buffer: %s", e)
+    try:
+        stdout_fd = os.dup(sys.stdout.fileno())
+        sys.stdout = io.TextIOWrapper(
+            io.BufferedWriter(io.FileIO(stdout_fd, mode="wb"), buffer_size=STDIO_BUFFER_SIZE),
+            encoding="utf-8",
+            line_buffering=True,
+        )
+    except (OSError, ValueError) as e:
+        log("Could not widen stdout buffer: %s", e)
+
+
 async def main():
     """Run the MCP server via stdio."""
-    async with stdio_server() as (read_stream, write_stream):
-        await app.run(read_stream, write_stream, app.create_initialization_options())
+    # Deferred: the stdio transport drags in anyio's stream machinery,
+    # which nothing at module import time needs
+    from mcp.server.stdio import stdio_server
+
+    _widen_stdio_buffers()
+
+    # Preconnect so the first tool call finds a warm socket instead of
+    # paying the TCP+TLS handshake inline. Best-effort: a Boswell outage
+    # at startup must not take the MCP server down with it.
+    try:
+        await _get_client().get("/branches", timeout=5.0)
+        log("Preconnected to Boswell API")
+    except Exception as e:
+        log("Preconnect failed, will retry on first call: %s", e)
+
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await app.run(read_stream, write_stream, app.create_initialization_options())
+    finally:
+        if _CLIENT is not None:
+            await _CLIENT.aclose()
 
 
 if __name__ == "__main__":
-    import asyncio
-    asyncio.run(main())
+    try:
+        # uvloop cuts per-await event-loop overhead; fall back to stdlib asyncio
+        import uvloop
+    except ImportError:
+        asyncio.run(main())
+    else:
+        uvloop.run(main())